@@ -2,12 +2,15 @@ import streamlit as st
 from lib import (
     get_available_fig,
     get_attribute_fig,
-    conf_name_map,
-    get_conf_time,
+    get_catalog,
     get_conf_attribute_fig,
     get_sunburst_fig,
-    get_count_data
+    get_count_data,
+    requires_build
 )
+from profiling import ENABLED as PROFILING, page_run
+from diagnostics import show_diagnostics
+from warmup import health, start_warm_up
 
 st.set_page_config(
     layout="wide",
@@ -18,6 +21,16 @@ st.set_page_config(
         "About":"Made by Xiao Fan"
     }
 )
+start_warm_up()
+# 部署检查用 ?health 查询本进程是否已为当前发布版本预热完成；第一次查询本身就会开始预热
+if "health" in st.query_params:
+    st.json(health())
+    st.stop()
+# 诊断页只在开启 PROFILE_HOT_PATHS 时注册，默认部署里 ?diagnostics 就是普通的首页
+if PROFILING and "diagnostics" in st.query_params:
+    show_diagnostics()
+    st.stop()
+page_run("Overview")
 
 st.title("Overview")
 
@@ -30,25 +43,34 @@ st.plotly_chart(get_attribute_fig())
 st.divider()
 
 st.header("Attribute Availability in Selected Conference and Time Range",divider="orange")
-col1, col2 = st.columns([4, 1])
-with col2:
-    select_conf = st.selectbox(
-        "Select conference to show",
-        list(conf_name_map.values()),
-        key="conf_attribute_selectbox"
-    )
-    if get_conf_time().loc[select_conf, "min"] < get_conf_time().loc[select_conf,"max"]:
-        begin_year, end_year = st.select_slider(
-            "Select interval to show",
-            options=range(get_conf_time().loc[select_conf, "min"],
-                          get_conf_time().loc[select_conf,  "max"] + 1),
-            value=(get_conf_time().loc[select_conf, "min"], get_conf_time().loc[select_conf,"max"]),
-            key="conf_attribute_slider"
+
+
+# 交互只重跑本段，页面上其余的图不会重新计算和发送
+@st.fragment
+@requires_build()
+def conf_attribute_section():
+    col1, col2 = st.columns([4, 1])
+    with col2:
+        select_conf = st.selectbox(
+            "Select conference to show",
+            get_catalog().names,
+            key="conf_attribute_selectbox"
         )
-    else:
-        begin_year, end_year = get_conf_time().loc[select_conf, "min"], get_conf_time().loc[select_conf, "min"]
-with col1:
-    st.plotly_chart(get_conf_attribute_fig(select_conf, begin_year, end_year))
+        conference = get_catalog()[select_conf]
+        if conference.first_year < conference.last_year:
+            begin_year, end_year = st.select_slider(
+                "Select interval to show",
+                options=range(conference.first_year, conference.last_year + 1),
+                value=(conference.first_year, conference.last_year),
+                key="conf_attribute_slider"
+            )
+        else:
+            begin_year, end_year = conference.first_year, conference.first_year
+    with col1:
+        st.plotly_chart(get_conf_attribute_fig(select_conf, begin_year, end_year))
+
+
+conf_attribute_section()
 st.divider()
 
 st.header("Proportion of Status Categories by Conference",divider="orange")
@@ -58,20 +80,27 @@ st.divider()
 
 
 st.header("Annual Paper Counts by Conference",divider="orange")
-col1, col2 = st.columns([4, 1])
-with col2:
-    options = st.multiselect(
-        "Select conference to show",
-        list(conf_name_map.values()),
-        default=list(conf_name_map.values()),
-        key="count_multiselectbox"
-    )
-with col1:
-    st.line_chart(
-        get_count_data().loc[lambda x: x.Conference.isin(options), :],
-        x="Year",
-        y="Count",
-        color="Conference",
-        height=800,
-    )
+
+
+@st.fragment
+def count_section():
+    col1, col2 = st.columns([4, 1])
+    with col2:
+        options = st.multiselect(
+            "Select conference to show",
+            get_catalog().names,
+            default=get_catalog().names,
+            key="count_multiselectbox"
+        )
+    with col1:
+        st.line_chart(
+            get_count_data().loc[lambda x: x.Conference.isin(options), :],
+            x="Year",
+            y="Count",
+            color="Conference",
+            height=800,
+        )
+
+
+count_section()
 
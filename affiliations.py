@@ -0,0 +1,81 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from ingest import RAW_DATASET, load, map_partitions
+from network import Network
+
+AFFILIATIONS_DIR = "./data/affiliations"
+AFF_COLUMN = "aff_unique_norm"
+
+
+def incidence(aff):
+    # 论文 × 机构的 0/1 矩阵，同一篇论文里重复出现的机构只记一次
+    pairs = (
+        aff
+        .reset_index(drop=True)
+        .str.split(";")
+        .explode()
+        .str.strip()
+        .loc[lambda x: x.notna() & (x != "")]
+        .rename_axis("paper")
+        .reset_index(name="institution")
+        .drop_duplicates()
+    )
+    codes, names = pd.factorize(pairs.institution)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(pairs), dtype=np.int32), (pairs.paper.to_numpy(), codes)),
+        shape=(len(aff), len(names))
+    )
+    return names, matrix
+
+
+def co_occurrence(matrix):
+    # B^T B 的对角线是各机构的论文数，(i, j) 是两家机构共同出现的论文数；只保留上三角
+    return sparse.triu(matrix.T @ matrix).tocoo()
+
+
+def _partition_counts(meeting, year, dataset_path):
+    aff = load(dataset_path, [AFF_COLUMN], meeting, (year, year))[AFF_COLUMN]
+    names, matrix = incidence(aff.astype("string"))
+    return meeting, year, np.asarray(names, dtype=object), co_occurrence(matrix)
+
+
+def build_affiliations(dataset_path=RAW_DATASET, out_dir=AFFILIATIONS_DIR, jobs=None):
+    # 每个 (会议, 年份) 是一块，各自在子进程里求共现矩阵，最后换成全局编号
+    results = map_partitions(_partition_counts, dataset_path, jobs)
+    institutions = pd.Index(sorted(set().union(*(names for _, _, names, _ in results))))
+
+    tmp_dir = out_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    slices = []
+    for meeting, year, names, counts in results:
+        codes = institutions.get_indexer(names)
+        row, col = codes[counts.row], codes[counts.col]
+        name = f"{meeting}_{year}.npz"
+        sparse.save_npz(os.path.join(tmp_dir, name), sparse.coo_matrix(
+            (counts.data, (np.minimum(row, col), np.maximum(row, col))), shape=(len(institutions), len(institutions))
+        ).tocsr())
+        slices.append((meeting, year, name))
+    pd.DataFrame({"institution": institutions}).to_csv(os.path.join(tmp_dir, "institutions.csv"), index=False)
+    pd.DataFrame(slices, columns=["meeting", "year", "file"]).to_csv(os.path.join(tmp_dir, "slices.csv"), index=False)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+
+
+def read_affiliations(meeting=None, years=None, out_dir=AFFILIATIONS_DIR):
+    institutions = pd.Index(pd.read_csv(os.path.join(out_dir, "institutions.csv"), keep_default_na=False).institution)
+    slices = pd.read_csv(os.path.join(out_dir, "slices.csv"))
+    if meeting is not None:
+        slices = slices.loc[slices.meeting == meeting, :]
+    if years is not None:
+        slices = slices.loc[slices.year.between(*years), :]
+
+    total = sparse.csr_matrix((len(institutions), len(institutions)), dtype=np.int64)
+    for name in slices.file:
+        total = total + sparse.load_npz(os.path.join(out_dir, name))
+    return Network(institutions, total.diagonal().astype(np.int64), sparse.triu(total, k=1).tocsr())
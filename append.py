@@ -0,0 +1,163 @@
+import argparse
+import os
+
+import pandas as pd
+
+from authors import append_authors, count_authors, remove_authors
+from conferences import canonical
+from availability import append_availability, remove_availability
+from build import (
+    MANIFEST_PATH,
+    STAGES,
+    CONF_TIME_PATH,
+    SUNBURST_PATH,
+    COUNT_PATH,
+    AUTHOR_NUMBER_PATH,
+    AUTHOR_NUMBER_DATA_PATH,
+    conf_time_rows,
+    sunburst_rows,
+    count_rows,
+    author_number_rows,
+    author_number_data_rows,
+    publish_batch,
+    read_manifest,
+    write_manifest,
+    record
+)
+from ingest import NUMERIC_DATASET, NUMERIC_RAW_CSV, RAW_CSV, RAW_DATASET, append_partition, check_batch, remove_partition
+
+# 这些阶段的产物由 append_batch 增量维护，其余阶段仍交给 build.py 重新计算
+INCREMENTAL_STAGES = [
+    "raw_dataset",
+    "availability",
+    "authors",
+    "conf_time",
+    "sunburst",
+    "count",
+    "author_number",
+    "author_number_data",
+]
+
+
+def _append_csv(csv_path, batch):
+    # 同时追加到源 CSV，之后完整重建也能得到同样的数据
+    header = pd.read_csv(csv_path, nrows=0).columns
+    batch.reindex(columns=header).to_csv(csv_path, mode="a", header=False, index=False)
+
+
+def _read_bytes(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _restore(path, content):
+    # content 为 None 表示原先没有这个文件
+    if content is None:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    with open(path + ".tmp", "wb") as f:
+        f.write(content)
+    os.replace(path + ".tmp", path)
+
+
+def _truncate(path, size):
+    with open(path, "r+b") as f:
+        f.truncate(size)
+
+
+def _write_batch(batch, numeric, meeting, year, manifest_path):
+    name = f"{meeting}_{year}"
+    papers, table = append_partition(batch, RAW_DATASET)
+    numeric_table = None
+    if numeric is not None:
+        _, numeric_table = append_partition(numeric, NUMERIC_DATASET)
+    authors = append_authors(papers, name)
+    append_availability(table, meeting, year)
+    counts = canonical(count_authors(papers, authors))
+    rows = canonical(papers)
+
+    (
+        pd.concat([pd.read_csv(CONF_TIME_PATH, index_col=0), conf_time_rows(rows)])
+        .groupby(level=0, sort=False)
+        .agg({"min": "min", "max": "max"})
+        .to_csv(CONF_TIME_PATH)
+    )
+    (
+        pd.concat([pd.read_csv(SUNBURST_PATH), sunburst_rows(rows)])
+        .groupby(["meeting", "status"], as_index=False, sort=False)["count"]
+        .sum()
+        .sort_values("count", ascending=False)
+        .to_csv(SUNBURST_PATH, index=False)
+    )
+    (
+        pd.concat([pd.read_csv(COUNT_PATH), count_rows(rows)])
+        .sort_values("Count", ascending=False)
+        .to_csv(COUNT_PATH, index=False)
+    )
+    author_number_rows(counts).to_csv(AUTHOR_NUMBER_PATH, mode="a", header=False, index=False)
+    (
+        pd.concat([pd.read_csv(AUTHOR_NUMBER_DATA_PATH), author_number_data_rows(counts)])
+        .to_csv(AUTHOR_NUMBER_DATA_PATH, index=False)
+    )
+    _append_csv(RAW_CSV, batch)
+
+    stages = list(INCREMENTAL_STAGES)
+    if numeric is not None:
+        _append_csv(NUMERIC_RAW_CSV, numeric)
+        stages.append("numeric_dataset")
+
+    manifest = read_manifest(manifest_path)
+    for stage in STAGES:
+        if stage.name in stages:
+            record(stage, manifest)
+    write_manifest(manifest, manifest_path)
+
+    # 发布新版本后，页面的缓存按版本失效，不需要另外清理
+    return publish_batch(table, numeric_table)
+
+
+def append_batch(raw_path, numeric_path=None, manifest_path=MANIFEST_PATH):
+    # 所有检查都在写入之前做完，检查不通过时数据保持原样
+    batch = pd.read_csv(raw_path, low_memory=False)
+    meeting, year = check_batch(batch, RAW_DATASET)
+    numeric = None
+    if numeric_path is not None:
+        numeric = pd.read_csv(numeric_path, low_memory=False)
+        check_batch(numeric, NUMERIC_DATASET, expected=(meeting, year))
+
+    # 写入过程中任何一步失败都整体撤销：新建的分区和文件删掉，整份重写的小文件换回原内容，追加的 CSV 截回原长度，
+    # 之后可以重新追加同一批数据
+    rewritten = {
+        path: _read_bytes(path)
+        for path in [CONF_TIME_PATH, SUNBURST_PATH, COUNT_PATH, AUTHOR_NUMBER_DATA_PATH, manifest_path]
+    }
+    appended = {
+        path: os.path.getsize(path)
+        for path in [AUTHOR_NUMBER_PATH, RAW_CSV] + ([NUMERIC_RAW_CSV] if numeric is not None else [])
+    }
+    try:
+        version = _write_batch(batch, numeric, meeting, year, manifest_path)
+    except Exception:
+        remove_partition(meeting, year, RAW_DATASET)
+        if numeric is not None:
+            remove_partition(meeting, year, NUMERIC_DATASET)
+        remove_authors(f"{meeting}_{year}")
+        remove_availability(meeting, year)
+        for path, content in rewritten.items():
+            _restore(path, content)
+        for path, size in appended.items():
+            _truncate(path, size)
+        raise
+    return meeting, year, version
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Append one conference-year batch to the stored data")
+    parser.add_argument("raw", help="CSV with the raw.csv columns for a single conference-year")
+    parser.add_argument("--numeric", help="matching CSV with the numeric_raw.csv columns")
+    args = parser.parse_args()
+    meeting, year, version = append_batch(args.raw, args.numeric)
+    print(f"Appended {meeting} {year} and published {version}; run build.py to refresh the remaining stages")
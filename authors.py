@@ -0,0 +1,64 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from ingest import RAW_DATASET, PAPER_ID, load
+
+AUTHORS_PATH = "./data/parquet/authors"
+
+
+def explode_authors(papers):
+    authors = (
+        papers
+        .set_index(PAPER_ID)
+        .author
+        # 原实现先按 "," 再按 ";" 切分，这里一次切完
+        .str.split(r"[,;]")
+        .explode()
+        .str.strip()
+        .loc[lambda x: x.notna() & (x != "")]
+    )
+    return pd.DataFrame({
+        PAPER_ID: authors.index.to_numpy(np.int64),
+        "position": authors.groupby(level=0).cumcount().to_numpy(np.int16),
+        "author": authors.astype("category").array,
+    })
+
+
+def build_authors(dataset_path=RAW_DATASET, out_path=AUTHORS_PATH):
+    tmp_path = out_path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    explode_authors(load(dataset_path, [PAPER_ID, "author"])).to_parquet(
+        os.path.join(tmp_path, "part-0.parquet"), index=False
+    )
+    shutil.rmtree(out_path, ignore_errors=True)
+    os.replace(tmp_path, out_path)
+
+
+def append_authors(papers, name, out_path=AUTHORS_PATH):
+    # 每批新数据单独写一个文件，读取时与已有文件合并
+    authors = explode_authors(papers)
+    authors.to_parquet(os.path.join(out_path, f"{name}.parquet"), index=False)
+    return authors
+
+
+def remove_authors(name, out_path=AUTHORS_PATH):
+    path = os.path.join(out_path, f"{name}.parquet")
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def read_authors(out_path=AUTHORS_PATH):
+    return pd.read_parquet(out_path)
+
+
+def count_authors(papers, authors):
+    counts = np.bincount(authors[PAPER_ID] - papers[PAPER_ID].min(), minlength=len(papers))
+    return papers.assign(author_number=counts[papers[PAPER_ID] - papers[PAPER_ID].min()])
+
+
+def author_counts(columns=("meeting", "year")):
+    return count_authors(load(RAW_DATASET, [PAPER_ID] + list(columns)), read_authors())
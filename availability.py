@@ -0,0 +1,158 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from ingest import RAW_DATASET, PARTITION_COLS, PAPER_ID, open_dataset
+
+AVAILABILITY_DIR = "./data/availability"
+# build.py 写出的整份位图；append.py 每追加一批写一个单独的 mask+NNNNNN.npy，offsets.csv 的 file 列指明每组在哪个文件
+MASK = "mask.npy"
+
+
+def _pack(table, columns):
+    # 每篇论文一行，每个字段一位
+    mask = np.column_stack([pc.is_valid(table.column(col)).to_numpy() for col in columns])
+    return np.packbits(mask.reshape(len(table), len(columns)), axis=1)
+
+
+def _column_counts(packed, n_columns):
+    # 逐位统计非空数量，避免把整个位图解包成 bool 矩阵
+    counts = np.stack([((packed >> (7 - bit)) & 1).sum(axis=0) for bit in range(8)], axis=1)
+    return counts.ravel()[:n_columns]
+
+
+def build_availability(dataset_path=RAW_DATASET, out_dir=AVAILABILITY_DIR):
+    dataset = open_dataset(dataset_path)
+    columns = [name for name in dataset.schema.names if name not in PARTITION_COLS + [PAPER_ID]]
+
+    groups = {}
+    for fragment in dataset.get_fragments():
+        keys = ds.get_partition_keys(fragment.partition_expression)
+        groups.setdefault((keys["meeting"], keys["year"]), []).append(fragment)
+
+    blocks, offsets, start = [], [], 0
+    for (meeting, year), fragments in sorted(groups.items()):
+        for fragment in fragments:
+            blocks.append(_pack(fragment.to_table(schema=dataset.schema, columns=columns), columns))
+        stop = start + sum(len(block) for block in blocks[-len(fragments):])
+        offsets.append((meeting, year, start, stop, MASK))
+        start = stop
+
+    tmp_dir = out_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    with open(os.path.join(tmp_dir, "columns.json"), "w") as f:
+        json.dump(columns, f)
+    pd.DataFrame(offsets, columns=["meeting", "year", "start", "stop", "file"]).to_csv(
+        os.path.join(tmp_dir, "offsets.csv"), index=False
+    )
+    np.save(os.path.join(tmp_dir, MASK), np.concatenate(blocks))
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+
+
+def read_index(out_dir=AVAILABILITY_DIR):
+    with open(os.path.join(out_dir, "columns.json")) as f:
+        columns = json.load(f)
+    offsets = pd.read_csv(os.path.join(out_dir, "offsets.csv"))
+    packed = {file: np.load(os.path.join(out_dir, file), mmap_mode="r") for file in offsets.file.unique()}
+    return columns, offsets, packed
+
+
+def _block(packed, row):
+    return packed[row.file][row.start:row.stop]
+
+
+def _corpus_counts(columns, packed):
+    return sum((_column_counts(mask, len(columns)) for mask in packed.values()), np.zeros(len(columns), dtype=int))
+
+
+def available_years(out_dir=AVAILABILITY_DIR):
+    _, offsets, _ = read_index(out_dir)
+    return offsets.assign(count=lambda x: x.stop - x.start).loc[:, ["meeting", "year", "count"]]
+
+
+def append_availability(table, meeting, year, out_dir=AVAILABILITY_DIR):
+    columns, offsets, _ = read_index(out_dir)
+    block = _pack(table, columns)
+
+    # 索引文件已经硬链接进发布的版本，不能原地追加：新批次单独写一个位图文件，只替换很小的 offsets.csv
+    file = "mask+{:06d}.npy".format(offsets.file.nunique())
+    np.save(os.path.join(out_dir, file + ".tmp.npy"), block)
+    pd.concat([offsets, pd.DataFrame([(meeting, year, 0, len(block), file)], columns=offsets.columns)]).to_csv(
+        os.path.join(out_dir, "offsets.csv.tmp"), index=False
+    )
+    os.replace(os.path.join(out_dir, file + ".tmp.npy"), os.path.join(out_dir, file))
+    os.replace(os.path.join(out_dir, "offsets.csv.tmp"), os.path.join(out_dir, "offsets.csv"))
+
+
+def remove_availability(meeting, year, out_dir=AVAILABILITY_DIR):
+    # 只用于撤销刚追加的一组：去掉 offsets.csv 里的那一行，它单独的位图文件一并删除
+    offsets = pd.read_csv(os.path.join(out_dir, "offsets.csv"))
+    drop = (offsets.meeting == meeting) & (offsets.year == year)
+    if not drop.any():
+        return
+    offsets.loc[~drop].to_csv(os.path.join(out_dir, "offsets.csv.tmp"), index=False)
+    os.replace(os.path.join(out_dir, "offsets.csv.tmp"), os.path.join(out_dir, "offsets.csv"))
+    for file in set(offsets.file[drop]) - set(offsets.file[~drop]):
+        os.remove(os.path.join(out_dir, file))
+
+
+def _group_counts(columns, offsets, packed):
+    return np.array([_column_counts(_block(packed, row), len(columns)) for row in offsets.itertuples()])
+
+
+def attribute_ratio(out_dir=AVAILABILITY_DIR):
+    columns, offsets, packed = read_index(out_dir)
+    return (
+        pd.DataFrame(_group_counts(columns, offsets, packed), columns=columns)
+        .groupby(offsets.meeting.to_numpy())
+        .sum()
+        .div(offsets.assign(count=lambda x: x.stop - x.start).groupby("meeting")["count"].sum(), axis=0)
+    )
+
+
+def conf_availability(meeting, start, end, out_dir=AVAILABILITY_DIR):
+    columns, offsets, packed = read_index(out_dir)
+    # 与原实现一致：只保留整个语料中至少有一个非空值的列
+    keep = _corpus_counts(columns, packed) > 0
+    groups = offsets.loc[lambda x: (x.meeting == meeting) & x.year.between(start, end), :].sort_values("year")
+    if groups.empty:
+        return pd.DataFrame(index=np.array(columns)[keep])
+
+    # 每个 (会议, 年份) 在位图中是连续的一段
+    mask = np.unpackbits(
+        np.concatenate([_block(packed, row) for row in groups.itertuples()]),
+        axis=1,
+        count=len(columns)
+    ).astype(bool)
+    years = np.repeat(groups.year.to_numpy(), groups.stop - groups.start)
+    # 可用的格子填入年份，缺失的格子留空
+    return pd.DataFrame(
+        np.where(mask[:, keep], years[:, None], np.nan),
+        columns=np.array(columns)[keep]
+    ).T
+
+
+def conf_availability_binned(meeting, start, end, buckets_per_year, out_dir=AVAILABILITY_DIR):
+    columns, offsets, packed = read_index(out_dir)
+    keep = _corpus_counts(columns, packed) > 0
+    groups = offsets.loc[lambda x: (x.meeting == meeting) & x.year.between(start, end), :].sort_values("year")
+
+    # 每年的论文按顺序等分成至多 buckets_per_year 段，每段给出各字段的可用比例
+    ratios, labels = [], []
+    for row in groups.itertuples():
+        bits = np.unpackbits(_block(packed, row), axis=1, count=len(columns))[:, keep].astype(np.int32)
+        edges = np.linspace(0, len(bits), min(buckets_per_year, len(bits)) + 1).astype(int)
+        ratios.append(np.add.reduceat(bits, edges[:-1], axis=0) / np.diff(edges)[:, None])
+        labels += [f"{row.year} ({i + 1}/{len(edges) - 1})" for i in range(len(edges) - 1)]
+    return pd.DataFrame(
+        np.vstack(ratios) if ratios else np.empty((0, keep.sum())),
+        index=labels,
+        columns=np.array(columns)[keep]
+    ).T
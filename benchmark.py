@@ -0,0 +1,175 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from profiling import payload_bytes
+from synthetic import SYNTHETIC_DIR, generate
+
+BENCHMARK_DIR = "./data/benchmark"
+RESULTS_PATH = os.path.join(BENCHMARK_DIR, "results.csv")
+SCALES = [1, 10, 100]
+# 与基线相比慢了这么多倍、且至少慢了 NOISE_SECONDS 秒才标记为回退，毫秒级的抖动不算
+REGRESSION_RATIO = 1.25
+NOISE_SECONDS = 0.05
+
+
+def cases():
+    import lib
+    import warmup
+
+    catalog = lib.get_catalog()
+    conference = catalog[catalog.names[0]]
+    attributes = lib.get_numeric_attributes(dropna=True)
+    years = (conference.first_year, conference.last_year)
+    tasks = {
+        "read_data": lambda: lib.read_data(["meeting", "year", "status"]),
+        "read_numeric_data": lambda: lib.read_numeric_data(None, conference.name, years),
+        "network": lib.get_network,
+        "graph_options": lib.get_graph_options,
+        "keywords": lib.get_keywords,
+        "conf_attribute_data": lambda: lib.get_conf_attribute_data(conference.name, *years),
+        "corr_data": lambda: lib.get_corr_data(conference.name, list(attributes[:3])),
+        "violin_data": lambda: lib.get_violin_data(conference.name, attributes[0], *years),
+        "keyword_trend_data": lambda: lib.get_keyword_trend_data(tuple(lib.get_keyword_options()[:3])),
+    }
+    tasks.update(warmup.base_tasks())
+    tasks.update(warmup.figure_tasks())
+    tasks.update({
+        "corr_fig": lambda: lib.get_corr_fig(conference.name, list(attributes[:3])),
+        "wordcloud": lambda: lib.get_wordcloud(conference.name, conference.wordcloud_years[-1]),
+    })
+    return tasks
+
+
+def clear_caches():
+    import streamlit as st
+
+    import lib
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    lib.FIGURE_CACHE.clear()
+
+
+def _call(func):
+    start = time.perf_counter()
+    try:
+        result, error = func(), None
+    except Exception as e:
+        result, error = None, repr(e)
+    return time.perf_counter() - start, result, error
+
+
+def measure(jobs=None):
+    # 在语料所在目录里运行：先构建，再逐个调用；冷、热两轮计时，另起一轮开 tracemalloc 测峰值内存。
+    # lib 等模块用的都是 ./data 下的相对路径，所以只在这里（子进程里）导入
+    import build
+    import lib
+    from ingest import RAW_DATASET, open_dataset
+
+    lib.quiet_bare_mode()
+
+    start = time.perf_counter()
+    built = build.build(force=True, jobs=jobs)
+    rows = [{"function": "build", "cold_s": time.perf_counter() - start, "error": None if built else "build failed"}]
+
+    tasks = cases()
+    clear_caches()
+    cold = {name: _call(func) for name, func in tasks.items()}
+    warm = {name: _call(func) for name, func in tasks.items()}
+
+    clear_caches()
+    tracemalloc.start()
+    peaks = {}
+    for name, func in tasks.items():
+        # 前面调用留在缓存里的内存不算在这次调用的峰值里
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        _call(func)
+        peaks[name] = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    for name in tasks:
+        (cold_s, _, error), (warm_s, result, _) = cold[name], warm[name]
+        rows.append({
+            "function": name,
+            "cold_s": cold_s,
+            "warm_s": warm_s,
+            "peak_bytes": peaks[name],
+            "payload_bytes": payload_bytes(result) if error is None else None,
+            "error": error,
+        })
+    # ru_maxrss 在 Linux 上以 KB 为单位
+    rows.append({"function": "process", "peak_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024})
+    return {"papers": open_dataset(RAW_DATASET).count_rows(), "rows": rows}
+
+
+def run_scale(scale, jobs=None, regenerate=False):
+    work_dir = os.path.join(SYNTHETIC_DIR, f"{scale:g}x")
+    if regenerate or not os.path.exists(os.path.join(work_dir, "data", "raw.csv")):
+        generate(scale, work_dir, jobs=jobs)
+
+    # 每个规模在新进程里跑，缓存和内存峰值互不影响
+    out_path = os.path.join(work_dir, "benchmark.json")
+    root = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+    command = [sys.executable, os.path.abspath(__file__), "--measure", "--output", os.path.abspath(out_path)]
+    if jobs is not None:
+        command += ["--jobs", str(jobs)]
+    subprocess.run(command, cwd=work_dir, env=env, check=True)
+    with open(out_path) as f:
+        report = json.load(f)
+    return pd.DataFrame(report["rows"]).assign(scale=scale, papers=report["papers"])
+
+
+def compare(results, baseline):
+    # 同一规模同一函数对比，冷热任一项变慢即标记
+    merged = results.merge(baseline, on=["scale", "function"], suffixes=("", "_baseline"))
+    for column in ["cold_s", "warm_s", "peak_bytes", "payload_bytes"]:
+        merged[column.removesuffix("_s").removesuffix("_bytes") + "_ratio"] = merged[column] / merged[f"{column}_baseline"]
+    merged["regressed"] = False
+    for column in ["cold_s", "warm_s"]:
+        merged["regressed"] |= (
+            (merged[column] > merged[f"{column}_baseline"] * REGRESSION_RATIO)
+            & (merged[column] - merged[f"{column}_baseline"] > NOISE_SECONDS)
+        )
+    return merged.loc[:, ["scale", "function", "cold_ratio", "warm_ratio", "peak_ratio", "payload_ratio", "regressed"]]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time every data and figure function in lib.py on synthetic corpora")
+    parser.add_argument("--scales", type=float, nargs="+", default=SCALES, help="corpus sizes as multiples of the real one")
+    parser.add_argument("--jobs", type=int, default=None, help="number of worker processes for generation and build")
+    parser.add_argument("--regenerate", action="store_true", help="regenerate corpora that already exist")
+    parser.add_argument("--output", default=RESULTS_PATH, help="CSV to write the results to")
+    parser.add_argument("--baseline", default=None, help="earlier results CSV to compare against")
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.measure:
+        report = measure(args.jobs)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        raise SystemExit(0)
+
+    results = pd.concat([run_scale(scale, args.jobs, args.regenerate) for scale in args.scales], ignore_index=True)
+    results = results.loc[:, ["scale", "papers", "function", "cold_s", "warm_s", "peak_bytes", "payload_bytes", "error"]]
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    results.to_csv(args.output, index=False)
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(results.drop(columns="error").to_string(index=False))
+        failed = results.loc[results.error.notna(), ["scale", "function", "error"]]
+        if len(failed):
+            print(failed.to_string(index=False))
+        if args.baseline is not None:
+            report = compare(results, pd.read_csv(args.baseline))
+            print(report.to_string(index=False))
+            if report.regressed.any():
+                raise SystemExit(1)
+    print(f"Results written to {args.output}")
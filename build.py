@@ -0,0 +1,320 @@
+import argparse
+import hashlib
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+import pyarrow as pa
+
+from affiliations import AFFILIATIONS_DIR, build_affiliations
+from authors import AUTHORS_PATH, author_counts, build_authors
+from availability import AVAILABILITY_DIR, build_availability
+from careers import AUTHOR_INFO_PATH, CAREERS_DIR, FIRST_AUTHOR_INFO_PATH, build_author_info, build_careers, read_career
+from conferences import canonical, canonical_meeting
+from correlations import CORRELATIONS_DIR, build_correlations
+from ingest import BUILD_DIR, NUMERIC_DATASET, NUMERIC_RAW_CSV, PAPER_ID, RAW_CSV, RAW_DATASET, ingest_csv, load, open_dataset
+from keywords import KEYWORDS_DIR, build_keywords
+from query import group_offsets, sort_for_index
+from shared import SHARED_DIR, next_segment, publish
+
+MANIFEST_PATH = "./data/build_manifest.json"
+
+CONF_TIME_PATH = "./data/build/conf_time_data.csv"
+SUNBURST_PATH = "./data/build/sunburst_data.csv"
+COUNT_PATH = "./data/build/count_data.csv"
+AUTHOR_NUMBER_PATH = "./data/build/author_number.csv"
+AUTHOR_NUMBER_DATA_PATH = "./data/build/author_number_data.csv"
+
+Stage = namedtuple("Stage", ["name", "inputs", "outputs", "func"])
+
+
+def build_raw_dataset():
+    ingest_csv(RAW_CSV, RAW_DATASET)
+
+
+def build_numeric_dataset():
+    ingest_csv(NUMERIC_RAW_CSV, NUMERIC_DATASET)
+
+
+def conf_time_rows(papers):
+    return (
+        papers
+        .groupby("meeting", observed=True)
+        .year
+        .agg(["min", "max"])
+    )
+
+
+def sunburst_rows(papers):
+    return (
+        papers
+        .groupby(["meeting", "status"], observed=True)
+        .size()
+        .sort_values(ascending=False)
+        .reset_index(name="count")
+    )
+
+
+def count_rows(papers):
+    return (
+        papers
+        .groupby(["meeting", "year"], observed=True)
+        .size()
+        .sort_values(ascending=False)
+        .reset_index(name="count")
+        .rename(columns={"meeting": "Conference", "year": "Year", "count": "Count"})
+    )
+
+
+def author_number_rows(counts):
+    return (
+        counts
+        .rename(columns={"meeting": "Conference", "title": "Title", "author_number": "Number of Authors per Paper"})
+        .loc[:, ["Conference", "Title", "Number of Authors per Paper"]]
+    )
+
+
+def author_number_data_rows(counts):
+    return (
+        counts
+        .loc[lambda x: x.author_number > 0, :]
+        .groupby(["meeting", "year"], observed=True)
+        .author_number
+        .mean()
+        .reset_index()
+        .rename(columns={"meeting": "Conference", "author_number": "Average Number of Co-authors per Paper", "year": "Year"})
+        .loc[:, ["Conference", "Average Number of Co-authors per Paper", "Year"]]
+    )
+
+
+def build_conf_time():
+    conf_time_rows(canonical(load(RAW_DATASET, ["year", "meeting"]))).to_csv(CONF_TIME_PATH)
+
+
+def build_sunburst():
+    sunburst_rows(canonical(load(RAW_DATASET, ["meeting", "status"]))).to_csv(SUNBURST_PATH, index=False)
+
+
+def build_count():
+    count_rows(canonical(load(RAW_DATASET, ["meeting", "year"]))).to_csv(COUNT_PATH, index=False)
+
+
+def build_author_number():
+    author_number_rows(canonical(author_counts(["meeting", "title"]))).to_csv(AUTHOR_NUMBER_PATH, index=False)
+
+
+def build_author_number_data():
+    author_number_data_rows(canonical(author_counts(["meeting", "year"]))).to_csv(AUTHOR_NUMBER_DATA_PATH, index=False)
+
+
+def indexed(name, table):
+    # meeting 存成以展示名为字典的编码列，页面读出来直接就是 Categorical
+    table = sort_for_index(table)
+    table = table.set_column(
+        table.schema.get_field_index("meeting"), "meeting", pa.array(canonical_meeting(table["meeting"].to_pandas()))
+    )
+    return {name: table, f"{name}.groups": group_offsets(table)}
+
+
+def summary_tables():
+    return {
+        "conf_time": pd.read_csv(CONF_TIME_PATH),
+        "sunburst": pd.read_csv(SUNBURST_PATH),
+        "count": pd.read_csv(COUNT_PATH),
+        "author_number": pd.read_csv(AUTHOR_NUMBER_PATH),
+        "author_number_data": pd.read_csv(AUTHOR_NUMBER_DATA_PATH),
+    }
+
+
+def publish_batch(raw_batch, numeric_batch=None):
+    # append.py 追加一批数据后，新批次作为 raw/numeric_raw 的新一段发布，带自己的组偏移，已发布的行不重写；
+    # 汇总表和可用性索引换成追加后的，其余表和目录沿用上一版本，等 build.py 再刷新
+    tables = {**indexed(next_segment("raw"), raw_batch), **summary_tables()}
+    if numeric_batch is not None:
+        tables.update(indexed(next_segment("numeric_raw"), numeric_batch))
+    return publish(tables, {"availability": AVAILABILITY_DIR})
+
+
+def build_shared():
+    # 页面读取的表和索引目录全部发布成一个新版本，各个 Streamlit 进程映射同一份文件
+    publish({
+        **indexed("raw", open_dataset(RAW_DATASET).to_table().sort_by(PAPER_ID)),
+        **indexed("numeric_raw", open_dataset(NUMERIC_DATASET).to_table()),
+        **summary_tables(),
+        "author_info": canonical(pd.read_csv(AUTHOR_INFO_PATH)),
+        **{
+            name.removesuffix(".parquet"): read_career(name.removesuffix(".parquet"))
+            for name in os.listdir(CAREERS_DIR)
+        },
+    }, {
+        "availability": AVAILABILITY_DIR,
+        "correlations": CORRELATIONS_DIR,
+        "affiliations": AFFILIATIONS_DIR,
+        "keywords": KEYWORDS_DIR,
+    })
+
+
+STAGES = [
+    Stage("raw_dataset", [RAW_CSV], [RAW_DATASET], build_raw_dataset),
+    Stage("numeric_dataset", [NUMERIC_RAW_CSV], [NUMERIC_DATASET], build_numeric_dataset),
+    Stage("availability", [RAW_DATASET], [AVAILABILITY_DIR], build_availability),
+    Stage("authors", [RAW_DATASET], [AUTHORS_PATH], build_authors),
+    Stage("correlations", [NUMERIC_DATASET], [CORRELATIONS_DIR], build_correlations),
+    Stage("affiliations", [RAW_DATASET], [AFFILIATIONS_DIR], build_affiliations),
+    Stage("keywords", [RAW_DATASET], [KEYWORDS_DIR], build_keywords),
+    Stage("conf_time", [RAW_DATASET], [CONF_TIME_PATH], build_conf_time),
+    Stage("sunburst", [RAW_DATASET], [SUNBURST_PATH], build_sunburst),
+    Stage("count", [RAW_DATASET], [COUNT_PATH], build_count),
+    Stage("author_number", [RAW_DATASET, AUTHORS_PATH], [AUTHOR_NUMBER_PATH], build_author_number),
+    Stage("author_number_data", [RAW_DATASET, AUTHORS_PATH], [AUTHOR_NUMBER_DATA_PATH], build_author_number_data),
+    Stage("author_info", [RAW_DATASET, AUTHORS_PATH], [FIRST_AUTHOR_INFO_PATH, AUTHOR_INFO_PATH], build_author_info),
+    Stage("careers", [FIRST_AUTHOR_INFO_PATH], [CAREERS_DIR], build_careers),
+    Stage(
+        "shared",
+        [RAW_DATASET, NUMERIC_DATASET, CONF_TIME_PATH, SUNBURST_PATH, COUNT_PATH, AUTHOR_NUMBER_PATH,
+         AUTHOR_NUMBER_DATA_PATH, AUTHOR_INFO_PATH, CAREERS_DIR, AVAILABILITY_DIR, CORRELATIONS_DIR,
+         AFFILIATIONS_DIR, KEYWORDS_DIR],
+        [SHARED_DIR],
+        build_shared
+    ),
+]
+
+
+def _file_hash(path, files):
+    # 大小和修改时间都没变时沿用上次的摘要，避免每次都重读 raw.csv
+    stat = os.stat(path)
+    cached = files.get(path)
+    if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+        return cached["sha256"]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    files[path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": h.hexdigest()}
+    return files[path]["sha256"]
+
+
+def content_hash(path, files):
+    if not os.path.isdir(path):
+        return _file_hash(path, files)
+    h = hashlib.sha256()
+    for root, dirs, names in os.walk(path):
+        dirs.sort()
+        for name in sorted(names):
+            full = os.path.join(root, name)
+            h.update(os.path.relpath(full, path).encode())
+            h.update(_file_hash(full, files).encode())
+    return h.hexdigest()
+
+
+def read_manifest(path=MANIFEST_PATH):
+    if not os.path.exists(path):
+        return {"stages": {}, "files": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_manifest(manifest, path=MANIFEST_PATH):
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def is_stale(stage, manifest):
+    if not all(os.path.exists(path) for path in stage.outputs):
+        return True
+    if not all(os.path.exists(path) for path in stage.inputs):
+        # 没有源数据（例如仓库里只带了派生文件）时保留现有产物
+        return False
+    recorded = manifest["stages"].get(stage.name, {}).get("inputs")
+    return recorded != {path: content_hash(path, manifest["files"]) for path in stage.inputs}
+
+
+def record(stage, manifest):
+    manifest["stages"][stage.name] = {
+        "inputs": {path: content_hash(path, manifest["files"]) for path in stage.inputs},
+        "outputs": {path: content_hash(path, manifest["files"]) for path in stage.outputs},
+    }
+
+
+def _dependencies(stages):
+    producers = {path: stage.name for stage in stages for path in stage.outputs}
+    return {
+        stage.name: {producers[path] for path in stage.inputs if path in producers}
+        for stage in stages
+    }
+
+
+def _select(targets, stages):
+    if not targets:
+        return {stage.name for stage in stages}
+    deps = _dependencies(stages)
+    selected, pending = set(), list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in deps:
+            raise KeyError(f"Unknown stage: {name}")
+        if name not in selected:
+            selected.add(name)
+            pending.extend(deps[name])
+    return selected
+
+
+def build(targets=None, force=False, jobs=None, stages=STAGES, manifest_path=MANIFEST_PATH):
+    manifest = read_manifest(manifest_path)
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    by_name = {stage.name: stage for stage in stages}
+    deps = _dependencies(stages)
+    selected = _select(targets, stages)
+    done, failed, running = set(), set(), {}
+
+    with ProcessPoolExecutor(jobs) as pool:
+        while len(done) + len(failed) < len(selected):
+            for name in sorted(selected - done - failed - set(running.values())):
+                stage = by_name[name]
+                if deps[name] & failed:
+                    failed.add(name)
+                    print(f"[skip] {name}: upstream failed")
+                elif deps[name] <= done:
+                    if not force and not is_stale(stage, manifest):
+                        done.add(name)
+                        print(f"[fresh] {name}")
+                    elif not all(os.path.exists(path) for path in stage.inputs):
+                        failed.add(name)
+                        print(f"[fail] {name}: missing {', '.join(p for p in stage.inputs if not os.path.exists(p))}")
+                    else:
+                        running[pool.submit(stage.func)] = name
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                stage = by_name[name]
+                try:
+                    future.result()
+                except Exception as e:
+                    failed.add(name)
+                    print(f"[fail] {name}: {e!r}")
+                    continue
+                record(stage, manifest)
+                write_manifest(manifest, manifest_path)
+                done.add(name)
+                print(f"[built] {name}")
+
+    write_manifest(manifest, manifest_path)
+    return not failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild stale derived data under ./data")
+    parser.add_argument("targets", nargs="*", help="stages to build, together with their dependencies")
+    parser.add_argument("--force", action="store_true", help="rebuild even if inputs are unchanged")
+    parser.add_argument("--jobs", type=int, default=None, help="number of worker processes")
+    args = parser.parse_args()
+    unknown = set(args.targets) - {stage.name for stage in STAGES}
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+    raise SystemExit(0 if build(args.targets, args.force, args.jobs) else 1)
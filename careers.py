@@ -0,0 +1,178 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from authors import AUTHORS_PATH
+from conferences import canonical
+from ingest import RAW_DATASET, PAPER_ID, load
+
+FIRST_AUTHOR_INFO_PATH = "./data/build/first_author_info.csv"
+AUTHOR_INFO_PATH = "./data/build/author_info.csv"
+CAREERS_DIR = "./data/parquet/careers"
+
+# 每个分桶大约容纳的署名行数，决定构建时的内存上限
+BUCKET_ROWS = 2_000_000
+
+
+def career_rows(authorship):
+    # 按 (作者, 年份) 排序后，所有指标都是组内的累计量
+    df = authorship.sort_values(["author", "year"], kind="stable")
+    df["elapsed"] = df.year - df.groupby("author", observed=True).year.transform("min")
+
+    paper_count = df.groupby(["author", "year"], observed=True).size()
+    # 每个 (作者, 会议) 第一次出现的年份记一次，再在作者内按年份累加
+    new_meetings = (
+        df
+        .drop_duplicates(["author", "meeting"])
+        .groupby(["author", "year"], observed=True)
+        .size()
+        .reindex(paper_count.index, fill_value=0)
+    )
+    per_year = pd.DataFrame({
+        "paper_count": paper_count,
+        "meeting_unique_count_upto_elapsed": new_meetings.groupby(level="author", observed=True).cumsum(),
+    })
+    first_author = df.loc[df.position == 0, :]
+    first_author_info = (
+        first_author
+        .loc[:, ["author", "meeting", "year", "elapsed"]]
+        .join(per_year, on=["author", "year"])
+    )
+
+    # 同一会议内，首次发表与首次以第一作者发表之间相隔的年数
+    first_year = df.groupby(["meeting", "author"], observed=True).year.min()
+    first_first_author_year = first_author.groupby(["meeting", "author"], observed=True).year.min()
+    author_info = (
+        (first_first_author_year - first_year.reindex(first_first_author_year.index))
+        .rename("interval")
+        .reset_index()
+    )
+    return first_author_info, author_info
+
+
+def _spill_buckets(tmp_dir, n_buckets):
+    # 按作者名哈希分桶落盘，同一作者的所有署名必定在同一个桶里
+    writers = {}
+    schema = pa.schema([(PAPER_ID, pa.int64()), ("position", pa.int16()), ("author", pa.string())])
+    for batch in ds.dataset(AUTHORS_PATH, format="parquet").to_batches(columns=[PAPER_ID, "position", "author"]):
+        df = batch.to_pandas()
+        author = df.author.astype("category")
+        buckets = (pd.util.hash_array(author.cat.categories.to_numpy(object)) % n_buckets)[author.cat.codes]
+        for bucket in np.unique(buckets):
+            if bucket not in writers:
+                writers[bucket] = pq.ParquetWriter(os.path.join(tmp_dir, f"{bucket}.parquet"), schema)
+            writers[bucket].write_table(
+                pa.Table.from_pandas(df.loc[buckets == bucket, :].astype({"author": str}), schema, preserve_index=False)
+            )
+    for writer in writers.values():
+        writer.close()
+    return sorted(writers)
+
+
+def build_author_info(first_author_path=FIRST_AUTHOR_INFO_PATH, author_info_path=AUTHOR_INFO_PATH):
+    papers = load(RAW_DATASET, [PAPER_ID, "meeting", "year"])
+    meeting = pd.Categorical(papers.meeting)
+    meeting_of = np.empty(papers[PAPER_ID].max() + 1, dtype=meeting.codes.dtype)
+    year_of = np.empty(papers[PAPER_ID].max() + 1, dtype=np.int16)
+    meeting_of[papers[PAPER_ID]] = meeting.codes
+    year_of[papers[PAPER_ID]] = papers.year
+    del papers
+
+    n_buckets = max(1, ds.dataset(AUTHORS_PATH, format="parquet").count_rows() // BUCKET_ROWS + 1)
+    tmp_dir = first_author_path + ".buckets"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    try:
+        header = True
+        for bucket in _spill_buckets(tmp_dir, n_buckets):
+            authorship = pd.read_parquet(os.path.join(tmp_dir, f"{bucket}.parquet"))
+            authorship = authorship.assign(
+                author=authorship.author.astype("category"),
+                meeting=pd.Categorical.from_codes(meeting_of[authorship[PAPER_ID]], meeting.categories),
+                year=year_of[authorship[PAPER_ID]],
+            )
+            first_author_info, author_info = career_rows(authorship)
+            mode = "w" if header else "a"
+            first_author_info.to_csv(first_author_path + ".tmp", mode=mode, header=header, index=False)
+            author_info.to_csv(author_info_path + ".tmp", mode=mode, header=header, index=False)
+            header = False
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.replace(first_author_path + ".tmp", first_author_path)
+    os.replace(author_info_path + ".tmp", author_info_path)
+
+
+def read_first_author_info(path=FIRST_AUTHOR_INFO_PATH):
+    info = pd.read_csv(
+        path,
+        usecols=["author", "meeting", "year", "elapsed", "paper_count", "meeting_unique_count_upto_elapsed"],
+        dtype={"author": "category", "meeting": "category"},
+    )
+    return info.assign(
+        year=info.year.astype("int16"),
+        elapsed=info.elapsed.astype("int16"),
+        paper_count=pd.to_numeric(info.paper_count, downcast="integer"),
+        meeting_unique_count_upto_elapsed=pd.to_numeric(info.meeting_unique_count_upto_elapsed, downcast="integer"),
+    )
+
+
+def career_aggregates(info):
+    # unique().explode() 等价于按 (分组键, 取值) 去重，全部用原生的分组归约完成
+    groups = info.groupby(["year", "author", "meeting"], observed=True).paper_count.agg(["count", "size"])
+    return {
+        "annual_paper": (
+            info
+            .groupby(["author", "elapsed"], observed=True)
+            .size()
+            .reset_index(name="Annual Paper Count")
+            .rename(columns={"author": "Author", "elapsed": "Years Since First Publication"})
+        ),
+        "unique_meeting": (
+            info
+            .loc[:, ["elapsed", "author", "meeting_unique_count_upto_elapsed"]]
+            .drop_duplicates()
+            .sort_values(["elapsed", "author"])
+            .assign(elapsed=lambda x: x.elapsed.astype(str))
+            .rename(columns={"elapsed": "Years Since First Publication",
+                             "meeting_unique_count_upto_elapsed": "Number of Distinct Conferences Published In",
+                             "author": "Author"})
+        ),
+        "paper_count": (
+            info
+            .loc[:, ["year", "author", "paper_count"]]
+            .drop_duplicates()
+            .sort_values(["year", "author"])
+            .assign(year=lambda x: x.year.astype(str))
+            .rename(columns={"year": "Year", "paper_count": "Annual Paper Count", "author": "Author"})
+        ),
+        # 每行的组大小再按 (年份, 会议) 求平均，即 sum(count * size) / sum(size)
+        "paper_count_data": (
+            groups
+            .assign(weighted=groups["count"] * groups["size"])
+            .groupby(["year", "meeting"], observed=True)[["weighted", "size"]]
+            .sum()
+            .pipe(lambda x: x.weighted / x["size"])
+            .rename("count_")
+            .reset_index()
+            .pipe(canonical)
+        ),
+    }
+
+
+def build_careers(path=FIRST_AUTHOR_INFO_PATH, out_dir=CAREERS_DIR):
+    tmp_dir = out_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for name, frame in career_aggregates(read_first_author_info(path)).items():
+        frame.to_parquet(os.path.join(tmp_dir, f"{name}.parquet"), index=False)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+
+
+def read_career(name, out_dir=CAREERS_DIR):
+    return pd.read_parquet(os.path.join(out_dir, f"{name}.parquet"))
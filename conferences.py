@@ -0,0 +1,113 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+conf_type_map = {
+    'CVPR': 'CV',
+    'ICCV': 'CV',
+    'ECCV': 'CV',
+    'WACV': 'CV',
+    'SIGGRAPH': 'CV',
+    'SIGGRAPH Asia': 'CV',
+
+    'ACL': 'NLP',
+    'EMNLP': 'NLP',
+    'CoLM': 'NLP',
+
+    'NeurIPS': 'ML',
+    'ICML': 'ML',
+    'ICLR': 'ML',
+    'AISTATS': 'ML',
+
+    'AAAI': 'AI',
+    'IJCAI': 'AI',
+
+    'The Web Conference': 'Others',
+    'ACM MM': 'Others',
+    'CoRL': 'Others'
+}
+conf_name_map = {
+    'cvpr': 'CVPR',
+    'colm': 'CoLM',
+    'acmmm': 'ACM MM',
+    'www': 'The Web Conference',
+    'icml': 'ICML',
+    'acl': 'ACL',
+    'corl': 'CoRL',
+    'nips': 'NeurIPS',
+    'siggraphasia': 'SIGGRAPH Asia',
+    'ijcai': 'IJCAI',
+    'wacv': 'WACV',
+    'iccv': 'ICCV',
+    'iclr': 'ICLR',
+    'eccv': 'ECCV',
+    'aaai': 'AAAI',
+    'aistats': 'AISTATS',
+    'siggraph': 'SIGGRAPH',
+    'emnlp': 'EMNLP'
+}
+reverse_conf_name_map = {
+    val:key for key, val in conf_name_map.items()
+}
+# meeting 列统一为以展示名为类别的 Categorical，编码即 conf_name_map 中的顺序
+MEETINGS = pd.CategoricalDtype(list(conf_name_map.values()))
+MEETING_CODES = {slug: code for code, slug in enumerate(conf_name_map)}
+
+
+def canonical_meeting(meeting):
+    # 只对不同的取值查一次表，再按编码构造，不再逐个单元格替换
+    slugs = pd.Categorical(meeting)
+    unknown = [slug for slug in slugs.categories if slug not in MEETING_CODES]
+    if unknown:
+        raise ValueError(f"Unknown conference {', '.join(map(str, unknown))}; add it to conf_name_map in conferences.py")
+    # 末尾补一个 -1，缺失值的编码 -1 正好取到它
+    codes = np.array([MEETING_CODES[slug] for slug in slugs.categories] + [-1], dtype=np.int8)
+    return pd.Categorical.from_codes(codes[slugs.codes], dtype=MEETINGS)
+
+
+def canonical(frame):
+    return frame.assign(meeting=canonical_meeting(frame.meeting))
+
+Conference = namedtuple(
+    "Conference",
+    ["name", "slug", "type", "first_year", "last_year", "available_years", "wordcloud_years"]
+)
+
+
+class Catalog:
+    # 启动时建一次，页面按名称或 slug 直接取会议的元数据
+    def __init__(self, conferences, version=None):
+        self.conferences = {conference.name: conference for conference in conferences}
+        self.slugs = {conference.slug: conference for conference in conferences}
+        self.names = list(self.conferences)
+        self.version = version
+
+    def __getitem__(self, name):
+        return self.conferences[name]
+
+    def __contains__(self, name):
+        return name in self.conferences
+
+    def __iter__(self):
+        return iter(self.conferences.values())
+
+    def from_slug(self, slug):
+        return self.slugs[slug]
+
+
+def build_catalog(conf_time, available, wordclouds, version=None):
+    # conf_time 以展示名为索引，available 为 (meeting, year) 行，wordclouds 为 keyword_years() 的结果
+    available = available.groupby("meeting").year.agg(lambda x: tuple(sorted(x))).to_dict()
+    return Catalog([
+        Conference(
+            name=name,
+            slug=slug,
+            type=conf_type_map[name],
+            first_year=int(conf_time.loc[name, "min"]) if name in conf_time.index else None,
+            last_year=int(conf_time.loc[name, "max"]) if name in conf_time.index else None,
+            available_years=available.get(slug, ()),
+            wordcloud_years=wordclouds.get(slug, ()),
+        )
+        for slug, name in conf_name_map.items()
+    ], version)
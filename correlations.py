@@ -0,0 +1,53 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+
+from ingest import NUMERIC_DATASET, load, numeric_columns, open_dataset
+
+CORRELATIONS_DIR = "./data/correlations"
+
+
+def pairwise_corr(x):
+    # 与 DataFrame.corr() 一致的成对完整 Pearson 相关系数，全部用矩阵乘法完成
+    present = ~np.isnan(x)
+    mask = present.astype(np.float64)
+    # 先按列均值平移，减小大数相减带来的误差，不影响相关系数
+    mean = np.where(present, x, 0.0).sum(axis=0) / np.maximum(present.sum(axis=0), 1)
+    x = np.where(present, x - mean, 0.0)
+
+    pairs = mask.T @ mask
+    sum_x = x.T @ mask
+    sum_xx = (x * x).T @ mask
+    sum_xy = x.T @ x
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sum_xy - sum_x * sum_x.T / pairs
+        var = sum_xx - sum_x * sum_x / pairs
+        corr = cov / np.sqrt(var * var.T)
+    corr[pairs < 1] = np.nan
+    return np.clip(corr, -1, 1), pairs.astype(np.int64)
+
+
+def build_correlations(dataset_path=NUMERIC_DATASET, out_dir=CORRELATIONS_DIR):
+    columns = numeric_columns(dataset_path)
+    meetings = pc.unique(open_dataset(dataset_path).to_table(columns=["meeting"]).column("meeting")).to_pylist()
+
+    tmp_dir = out_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for meeting in meetings:
+        x = load(dataset_path, columns, meeting).to_numpy(np.float64)
+        corr, pairs = pairwise_corr(x)
+        pd.DataFrame(corr, index=columns, columns=columns).to_parquet(os.path.join(tmp_dir, f"{meeting}.corr.parquet"))
+        pd.DataFrame(pairs, index=columns, columns=columns).to_parquet(os.path.join(tmp_dir, f"{meeting}.pairs.parquet"))
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+
+
+def read_correlations(meeting, out_dir=CORRELATIONS_DIR):
+    return (
+        pd.read_parquet(os.path.join(out_dir, f"{meeting}.corr.parquet")),
+        pd.read_parquet(os.path.join(out_dir, f"{meeting}.pairs.parquet"))
+    )
@@ -0,0 +1,44 @@
+import json
+
+import streamlit as st
+
+import profiling
+from lib import FIGURE_CACHE
+from shared import current_version
+from warmup import is_ready
+
+
+def status():
+    return {
+        "shared_version": current_version(),
+        "warm": is_ready(),
+        "figure_cache": FIGURE_CACHE.stats(),
+    }
+
+
+def show_diagnostics():
+    # 不在侧边栏里出现，只有以 PROFILE_HOT_PATHS=1 启动时才能通过 ?diagnostics 打开
+    st.title("Diagnostics")
+    snapshot = profiling.snapshot(status())
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Shared data version", snapshot["shared_version"] or "-")
+    col2.metric("Warmed in this process", "yes" if snapshot["warm"] else "no")
+    hit_rate = snapshot["figure_cache"]["hit_rate"]
+    col3.metric("Figure cache hit rate", f"{hit_rate:.0%}" if hit_rate is not None else "-")
+
+    st.header("Page runs", divider="orange")
+    st.dataframe(snapshot["page_runs"], use_container_width=True)
+    st.header("Functions", divider="orange")
+    st.dataframe(snapshot["functions"], use_container_width=True)
+    st.header("Figure cache", divider="orange")
+    st.json(snapshot["figure_cache"])
+
+    st.download_button(
+        "Download JSON",
+        json.dumps(snapshot, indent=2, default=str),
+        file_name="profile.json",
+        mime="application/json",
+    )
+    if st.button(f"Write {profiling.PROFILE_PATH}"):
+        st.success(f"Wrote {profiling.dump(extra=status())}")
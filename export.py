@@ -0,0 +1,120 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import plotly.io as pio
+
+import lib
+from shared import current_version
+
+EXPORT_DIR = "./data/export"
+FORMATS = ["json", "html"]
+
+
+def export_tasks():
+    # (输出名, lib 中的函数名, 参数)，参数与各页面打开时的默认选项一致
+    catalog = lib.get_catalog()
+    attributes = lib.get_numeric_attributes(dropna=True)
+    corr_attributes = [attribute for attribute in lib.CORR_ATTRIBUTES if attribute in lib.get_numeric_attributes()]
+    tasks = [
+        (name, f"get_{name}_fig", ())
+        for name in ["sunburst", "available", "attribute", "unique_meeting", "annual_paper", "paper_count", "interval",
+                     "author_number"]
+    ]
+    tasks.append(("collaborate_graph/all", "get_collaborate_graph", ()))
+    for conference in catalog:
+        if conference.first_year is None:
+            continue
+        years = (conference.first_year, conference.last_year)
+        tasks += [
+            (f"conf_attribute/{conference.slug}", "get_conf_attribute_fig", (conference.name, *years)),
+            (f"corr/{conference.slug}", "get_corr_fig", (conference.name, corr_attributes)),
+            (f"violin/{conference.slug}", "get_violin_fig", (conference.name, attributes[0], *years)),
+            (f"collaborate_graph/{conference.slug}", "get_collaborate_graph",
+             (0, lib.GRAPH_TOP_K, None, 1, conference.name)),
+        ]
+    return tasks
+
+
+def _write(out_dir, name, text):
+    data = text.encode()
+    path = os.path.join(out_dir, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # mtime=0 让同样的图得到同样的文件，便于增量同步
+    with open(path, "wb") as f:
+        f.write(gzip.compress(data, mtime=0))
+    return {"path": name, "bytes": os.path.getsize(path), "raw_bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def export_one(task, out_dir, formats):
+    name, function, args = task
+    entry = {"name": name, "function": function, "args": list(args), "files": {}, "error": None}
+    start = time.perf_counter()
+    try:
+        result = getattr(lib, function)(*args)
+        if result is None:
+            # 合作网络在筛选后没有边时返回 None
+            entry["error"] = "empty"
+        elif isinstance(result, str):
+            # 合作网络本身就是一段 HTML
+            entry["files"]["html"] = _write(out_dir, f"{name}.html.gz", result)
+        else:
+            if "json" in formats:
+                entry["files"]["json"] = _write(out_dir, f"{name}.json.gz", result.to_json())
+            if "html" in formats:
+                # plotly.js 走 CDN，每个文件只有图本身的数据
+                html = pio.to_html(result, include_plotlyjs="cdn", full_html=True)
+                entry["files"]["html"] = _write(out_dir, f"{name}.html.gz", html)
+    except Exception as e:
+        entry["error"] = repr(e)
+    entry["seconds"] = time.perf_counter() - start
+    return entry
+
+
+def export(out_dir=EXPORT_DIR, jobs=None, formats=FORMATS):
+    start = time.perf_counter()
+    tmp_dir = out_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    tasks = export_tasks()
+    # 每个子进程各自加载所需的共享表（内存映射，开销很小），之后独立生成分到的图
+    with ProcessPoolExecutor(jobs, initializer=lib.quiet_bare_mode) as pool:
+        entries = list(pool.map(export_one, tasks, [tmp_dir] * len(tasks), [formats] * len(tasks)))
+    manifest = {
+        "version": current_version(),
+        "generated_at": time.time(),
+        "seconds": time.perf_counter() - start,
+        "formats": formats,
+        "figures": entries,
+    }
+    with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export every figure as gzip-compressed Plotly JSON / HTML")
+    parser.add_argument("--out", default=EXPORT_DIR, help="output directory")
+    parser.add_argument("--jobs", type=int, default=None, help="number of worker processes (default: one per core)")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=FORMATS)
+    args = parser.parse_args()
+    lib.quiet_bare_mode()
+    manifest = export(args.out, args.jobs, args.formats)
+    # 筛选后没有内容的图不写文件，也不算失败
+    empty = [entry for entry in manifest["figures"] if entry.get("error") == "empty"]
+    failed = [entry for entry in manifest["figures"] if entry.get("error") not in (None, "empty")]
+    for entry in empty:
+        print(f"[empty] {entry['name']}")
+    for entry in failed:
+        print(f"[fail] {entry['name']}: {entry['error']}")
+    exported = len(manifest["figures"]) - len(empty) - len(failed)
+    print(f"Exported {exported} figures to {args.out} in {manifest['seconds']:.1f}s "
+          f"({len(empty)} empty, {len(failed)} failed)")
+    raise SystemExit(1 if failed else 0)
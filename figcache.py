@@ -0,0 +1,143 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from functools import wraps
+
+import plotly.io as pio
+from cachetools import LRUCache
+
+FIGURE_CACHE_DIR = "./data/figure_cache"
+MEMORY_BYTES = 64 << 20
+DISK_BYTES = 512 << 20
+
+
+def _plain(value):
+    # numpy 标量与同值的 Python 数字应当得到同一个键
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+class _CountingLRU(LRUCache):
+    def __init__(self, maxsize, counters):
+        super().__init__(maxsize, getsizeof=len)
+        self.counters = counters
+
+    def popitem(self):
+        item = super().popitem()
+        self.counters["evictions"] += 1
+        return item
+
+
+class FigureCache:
+    # 图以 JSON 字符串缓存：内存里按字节数做 LRU，磁盘上按修改时间做 LRU，多个进程共用磁盘目录
+    def __init__(self, directory=FIGURE_CACHE_DIR, memory_bytes=MEMORY_BYTES, disk_bytes=DISK_BYTES, version=None):
+        self.directory = directory
+        self.disk_bytes = disk_bytes
+        self.version = version
+        self.counters = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "disk_evictions": 0}
+        self._memory = _CountingLRU(memory_bytes, self.counters)
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json.gz")
+
+    def key(self, name, args):
+        # 数据发布新版本后键随之改变，旧图不会再被命中，之后按 LRU 淘汰
+        version = self.version() if self.version is not None else None
+        return hashlib.sha256(json.dumps([name, version, args], default=_plain).encode()).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self.counters["hits"] += 1
+                return value
+        try:
+            with gzip.open(self._path(key), "rt") as f:
+                value = f.read()
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            with self._lock:
+                self.counters["misses"] += 1
+            return None
+        with self._lock:
+            self.counters["disk_hits"] += 1
+            self._remember(key, value)
+        return value
+
+    def _remember(self, key, value):
+        # 单个结果超过内存预算时只写磁盘
+        if len(value) <= self._memory.maxsize:
+            self._memory[key] = value
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+        if not self.disk_bytes:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, "wt", compresslevel=6) as f:
+            f.write(value)
+        os.replace(tmp_path, self._path(key))
+        self._trim_disk()
+
+    def _disk_entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json.gz"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _trim_disk(self):
+        entries = sorted(self._disk_entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            with self._lock:
+                self.counters["disk_evictions"] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters, entries=len(self._memory), bytes=self._memory.currsize)
+        entries = self._disk_entries() if os.path.isdir(self.directory) else []
+        stats.update(disk_entries=len(entries), disk_bytes=sum(size for _, size, _ in entries))
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["disk_hits"]) / lookups if lookups else None
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if os.path.isdir(self.directory):
+            for _, _, path in self._disk_entries():
+                os.remove(path)
+
+    def _cached(self, func, dump, load):
+        @wraps(func)
+        def wrapper(*args):
+            key = self.key(func.__name__, args)
+            value = self.get(key)
+            if value is None:
+                value = dump(func(*args))
+                self.put(key, value)
+            return load(value)
+        return wrapper
+
+    def __call__(self, func):
+        return self._cached(func, lambda fig: fig.to_json(pretty=False, remove_uids=True), pio.from_json)
+
+    def text(self, func):
+        # 直接生成 HTML 的结果（合作网络）按原文缓存；返回 None 表示没有结果，存为空串
+        return self._cached(func, lambda text: text or "", lambda text: text or None)
@@ -0,0 +1,151 @@
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from conferences import canonical_meeting
+
+RAW_CSV = "./data/raw.csv"
+NUMERIC_RAW_CSV = "./data/numeric_raw.csv"
+RAW_DATASET = "./data/parquet/raw"
+NUMERIC_DATASET = "./data/parquet/numeric_raw"
+# build.py 派生的汇总表写在这里，不进版本库；data/ 下受版本管理的同名 CSV 只是随仓库附带的快照
+BUILD_DIR = "./data/build"
+PARTITION_COLS = ["meeting", "year"]
+PAPER_ID = "paper_id"
+
+SOURCES = {
+    RAW_DATASET: RAW_CSV,
+    NUMERIC_DATASET: NUMERIC_RAW_CSV,
+}
+
+
+def _to_table(df):
+    # arrow 不接受混合类型的 object 列，统一转成字符串（保留缺失值）
+    for col in df.select_dtypes(include="object").columns:
+        df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def ingest_csv(csv_path, dataset_path):
+    df = (
+        pd.read_csv(csv_path, low_memory=False)
+        .sort_values(PARTITION_COLS, kind="stable")
+        .reset_index(drop=True)
+    )
+    if dataset_path == RAW_DATASET:
+        # 论文编号即排序后的行号，作者表等派生数据通过它关联回论文
+        df[PAPER_ID] = np.arange(len(df), dtype=np.int64)
+    table = _to_table(df)
+    tmp_path = dataset_path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    # 固定文件名，保证同样的输入得到同样的内容哈希
+    pq.write_to_dataset(table, tmp_path, partition_cols=PARTITION_COLS, basename_template="part-{i}.parquet")
+    shutil.rmtree(dataset_path, ignore_errors=True)
+    os.replace(tmp_path, dataset_path)
+
+
+def check_batch(df, dataset_path, expected=None):
+    keys = df.loc[:, PARTITION_COLS].drop_duplicates()
+    if len(keys) != 1:
+        raise ValueError(f"A batch must contain exactly one conference-year, got {len(keys)}")
+    meeting, year = keys.iloc[0].meeting, int(keys.iloc[0].year)
+    if expected is not None and (meeting, year) != tuple(expected):
+        raise ValueError(f"Batch is {meeting} {year}, expected {expected[0]} {expected[1]}")
+    # 未登记的会议在写入前报错，不要等分区写完、汇总时才失败
+    canonical_meeting([meeting])
+    if open_dataset(dataset_path).count_rows(filter=(ds.field("meeting") == meeting) & (ds.field("year") == year)):
+        raise ValueError(f"{meeting} {year} is already ingested into {dataset_path}")
+    return meeting, year
+
+
+def append_partition(df, dataset_path):
+    check_batch(df, dataset_path)
+    dataset = open_dataset(dataset_path)
+    df = df.reset_index(drop=True)
+    if dataset_path == RAW_DATASET:
+        # 编号连续递增，新批次接在末尾
+        df[PAPER_ID] = np.arange(len(df), dtype=np.int64) + dataset.count_rows()
+    table = _to_table(df.reindex(columns=dataset.schema.names)).cast(dataset.schema)
+    pq.write_to_dataset(table, dataset_path, partition_cols=PARTITION_COLS, basename_template="part-{i}.parquet")
+    return df, table
+
+
+def remove_partition(meeting, year, dataset_path):
+    # 只用于撤销刚追加、此前不存在的分区
+    shutil.rmtree(os.path.join(dataset_path, f"meeting={meeting}", f"year={year}"), ignore_errors=True)
+
+
+def open_dataset(dataset_path):
+    return ds.dataset(dataset_path, format="parquet", partitioning="hive")
+
+
+def partition_filter(meeting=None, years=None):
+    expr = None
+    if meeting is not None:
+        expr = ds.field("meeting") == meeting
+    if years is not None:
+        begin, end = years
+        year_expr = (ds.field("year") >= begin) & (ds.field("year") <= end)
+        expr = year_expr if expr is None else expr & year_expr
+    return expr
+
+
+def load(dataset_path, columns=None, meeting=None, years=None):
+    return open_dataset(dataset_path).to_table(columns=columns, filter=partition_filter(meeting, years)).to_pandas()
+
+
+def partitions(dataset_path):
+    return sorted({
+        (keys["meeting"], keys["year"])
+        for keys in (ds.get_partition_keys(f.partition_expression) for f in open_dataset(dataset_path).get_fragments())
+    })
+
+
+def map_partitions(func, dataset_path, jobs=None):
+    # 每个 (会议, 年份) 在子进程里调用一次 func(meeting, year, dataset_path)，结果按分区排序返回
+    keys = partitions(dataset_path)
+    with ProcessPoolExecutor(jobs) as pool:
+        return list(pool.map(func, [m for m, _ in keys], [y for _, y in keys], [dataset_path] * len(keys)))
+
+
+def numeric_columns(dataset_path, dropna=False):
+    dataset = open_dataset(dataset_path)
+    columns = [
+        field.name for field in dataset.schema
+        if pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+    ]
+    if not dropna:
+        return columns
+
+    # 只看 parquet 元数据里的 null_count，不读取任何数据页
+    non_empty = set(PARTITION_COLS)
+    for fragment in dataset.get_fragments():
+        metadata = fragment.metadata
+        for i in range(metadata.num_row_groups):
+            row_group = metadata.row_group(i)
+            for j in range(row_group.num_columns):
+                column = row_group.column(j)
+                stats = column.statistics
+                if stats is None or not stats.has_null_count or stats.null_count < row_group.num_rows:
+                    non_empty.add(column.path_in_schema)
+    return [col for col in columns if col in non_empty]
+
+
+def table_numeric_columns(table, dropna=False):
+    # 已发布的映射表：字段取自 schema，空值数取自各列的元数据，同样不读数据页
+    return [
+        field.name for field in table.schema
+        if (pa.types.is_integer(field.type) or pa.types.is_floating(field.type))
+        and not (dropna and table[field.name].null_count == table.num_rows)
+    ]
+
+
+if __name__ == "__main__":
+    for dataset_path, csv_path in SOURCES.items():
+        ingest_csv(csv_path, dataset_path)
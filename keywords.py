@@ -0,0 +1,112 @@
+import io
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+
+from ingest import RAW_DATASET, load, map_partitions
+
+KEYWORDS_DIR = "./data/keywords"
+TEXT_COLUMNS = ["title", "abstract"]
+# 全库出现的论文数少于该值的词不进索引
+MIN_PAPERS = 5
+WORDCLOUD_WORDS = 200
+
+
+def _vectorizer():
+    return CountVectorizer(
+        stop_words="english",
+        token_pattern=r"(?u)\b[a-zA-Z][a-zA-Z-]+[a-zA-Z]\b",
+        binary=True,
+        dtype=np.int32
+    )
+
+
+def _partition_counts(meeting, year, dataset_path):
+    papers = load(dataset_path, TEXT_COLUMNS, meeting, (year, year)).fillna("")
+    texts = papers.title + " " + papers.abstract
+    vectorizer = _vectorizer()
+    try:
+        matrix = vectorizer.fit_transform(texts)
+    except ValueError:
+        # 整个分区都没有可用的文本
+        return meeting, year, len(texts), np.array([], dtype=object), np.array([], dtype=np.int64)
+    # binary=True，按列求和即每个词出现在多少篇论文里
+    counts = np.asarray(matrix.sum(axis=0)).ravel()
+    return meeting, year, len(texts), vectorizer.get_feature_names_out().astype(object), counts
+
+
+def build_keywords(dataset_path=RAW_DATASET, out_dir=KEYWORDS_DIR, jobs=None):
+    results = map_partitions(_partition_counts, dataset_path, jobs)
+
+    terms = pd.Index(sorted(set().union(*(names for _, _, _, names, _ in results))))
+    rows, cols, data = [], [], []
+    for i, (_, _, _, names, counts) in enumerate(results):
+        rows.append(np.full(len(names), i))
+        cols.append(terms.get_indexer(names))
+        data.append(counts)
+    matrix = sparse.csr_matrix(
+        (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))), shape=(len(results), len(terms))
+    )
+    keep = np.asarray(matrix.sum(axis=0)).ravel() >= MIN_PAPERS
+    groups = pd.DataFrame([(m, y, n) for m, y, n, _, _ in results], columns=["meeting", "year", "papers"])
+
+    tmp_dir = out_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    groups.to_csv(os.path.join(tmp_dir, "groups.csv"), index=False)
+    pd.DataFrame({"term": terms[keep]}).to_csv(os.path.join(tmp_dir, "terms.csv"), index=False)
+    sparse.save_npz(os.path.join(tmp_dir, "counts.npz"), matrix[:, keep].tocsr())
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+
+
+def read_keywords(out_dir=KEYWORDS_DIR):
+    groups = pd.read_csv(os.path.join(out_dir, "groups.csv"))
+    terms = pd.Index(pd.read_csv(os.path.join(out_dir, "terms.csv"), keep_default_na=False).term)
+    return groups, terms, sparse.load_npz(os.path.join(out_dir, "counts.npz"))
+
+
+def keyword_years(keywords):
+    # 至少有一个词留在索引里的 (会议, 年份) 才能画词云；有论文但词都被 MIN_PAPERS 过滤掉时画不出来
+    groups, _, matrix = keywords
+    return groups.loc[matrix.getnnz(axis=1) > 0, :].groupby("meeting").year.agg(lambda x: tuple(sorted(x))).to_dict()
+
+
+def term_frequencies(keywords, meeting=None, year=None, top=None):
+    groups, terms, matrix = keywords
+    selected = np.flatnonzero(
+        ((groups.meeting == meeting) if meeting is not None else True)
+        & ((groups.year == year) if year is not None else True)
+    )
+    counts = pd.Series(np.asarray(matrix[selected].sum(axis=0)).ravel(), index=terms)
+    counts = counts.loc[counts > 0].sort_values(ascending=False, kind="stable")
+    return counts if top is None else counts.iloc[:top]
+
+
+def keyword_trend(keywords, words, meeting=None):
+    # 每年提到该词的论文占当年论文的比例
+    groups, terms, matrix = keywords
+    words = [word for word in words if word in terms]
+    selected = groups.meeting == meeting if meeting is not None else np.ones(len(groups), dtype=bool)
+    columns = terms.get_indexer(words)
+    counts = pd.DataFrame(
+        matrix[np.flatnonzero(selected)][:, columns].toarray(), columns=list(words)
+    ).assign(year=groups.year[selected].to_numpy(), papers=groups.papers[selected].to_numpy())
+    totals = counts.groupby("year").sum()
+    return totals.loc[:, list(words)].div(totals.papers, axis=0).rename_axis("Year").reset_index()
+
+
+def render_wordcloud(frequencies, width=1600, height=800):
+    # 只有渲染时才用到 wordcloud，按需导入
+    from wordcloud import WordCloud
+
+    image = WordCloud(width=width, height=height, background_color="black").generate_from_frequencies(
+        frequencies.to_dict()
+    ).to_image()
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
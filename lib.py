@@ -1,126 +1,253 @@
 import os
+from contextlib import contextmanager
+from functools import wraps
 
 import streamlit as st
 import pandas as pd
+from streamlit.logger import set_log_level
 import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
-from d3graph import d3graph,vec2adjmat
-
-conf_type_map = {
-    'CVPR': 'CV',
-    'ICCV': 'CV',
-    'ECCV': 'CV',
-    'WACV': 'CV',
-    'SIGGRAPH': 'CV',
-    'SIGGRAPH Asia': 'CV',
-
-    'ACL': 'NLP',
-    'EMNLP': 'NLP',
-    'CoLM': 'NLP',
-
-    'NeurIPS': 'ML',
-    'ICML': 'ML',
-    'ICLR': 'ML',
-    'AISTATS': 'ML',
-
-    'AAAI': 'AI',
-    'IJCAI': 'AI',
-
-    'The Web Conference': 'Others',
-    'ACM MM': 'Others',
-    'CoRL': 'Others'
-}
-conf_name_map = {
-    'cvpr': 'CVPR',
-    'colm': 'CoLM',
-    'acmmm': 'ACM MM',
-    'www': 'The Web Conference',
-    'icml': 'ICML',
-    'acl': 'ACL',
-    'corl': 'CoRL',
-    'nips': 'NeurIPS',
-    'siggraphasia': 'SIGGRAPH Asia',
-    'ijcai': 'IJCAI',
-    'wacv': 'WACV',
-    'iccv': 'ICCV',
-    'iclr': 'ICLR',
-    'eccv': 'ECCV',
-    'aaai': 'AAAI',
-    'aistats': 'AISTATS',
-    'siggraph': 'SIGGRAPH',
-    'emnlp': 'EMNLP'
-}
-reverse_conf_name_map = {
-    val:key for key, val in conf_name_map.items()
+
+from conferences import conf_name_map, reverse_conf_name_map, build_catalog
+from ingest import table_numeric_columns
+from availability import available_years, attribute_ratio, conf_availability, conf_availability_binned
+from correlations import read_correlations
+from violin import summary_violin
+from shared import current_version, open_segments, open_table, segment_names, shared_path
+from figcache import FigureCache
+from query import TableIndex
+from network import subgraph, render
+from affiliations import read_affiliations
+from profiling import profiled
+from keywords import WORDCLOUD_WORDS, keyword_trend, keyword_years, read_keywords, render_wordcloud, term_frequencies
+
+# 为 True 时在服务端算好核密度、四分位数和离群点，只把汇总结果发给浏览器；
+# 为 False 时退回 px.violin，把每个数据点都发给浏览器
+SUMMARY_VIOLINS = True
+
+# 基础数据用 st.cache_resource 在所有会话间共享同一个对象，不再逐次反序列化出副本；
+# 调用方只能用 loc/rename/assign 等返回新对象的操作，不能原地修改拿到的表
+
+# 图统一用有上限的 LRU 缓存，磁盘层由所有进程共用，warmup.py 可以提前填好；
+# FIGURE_CACHE.stats() 给出命中、淘汰和占用
+FIGURE_CACHE = FigureCache(version=current_version)
+
+# 全新克隆里还没有运行过 build.py 时，退回到仓库里提交的快照；快照里没有的部分照常抛出 FileNotFoundError，
+# 页面用 requires_build 包住各段，只在该段显示提示
+SNAPSHOT_TABLES = {
+    "conf_time": "./data/conf_time_data.csv",
+    "sunburst": "./data/sunburst_data.csv",
+    "count": "./data/count_data.csv",
+    "author_number_data": "./data/author_number_data.csv",
 }
+SNAPSHOT_AVAILABLE_PATH = "./data/available.csv"
+SNAPSHOT_ATTRIBUTE_PATH = "./data/attribute_data.csv"
+SNAPSHOT_WORDCLOUD_DIR = "./data/wordcloud"
+SNAPSHOT_GRAPH_PATH = "./data/graph.html"
+
+
+def is_snapshot():
+    return current_version() is None
+
+
+def quiet_bare_mode():
+    # 脱离 streamlit run 调用缓存函数时，每次都会告警缺少运行时；warmup、export、benchmark 在开始前调用
+    set_log_level("error")
+
+
+@contextmanager
+def requires_build():
+    try:
+        yield
+    except FileNotFoundError as e:
+        st.warning(f"This section needs the tables derived by build.py, which have not been published yet ({e})")
+
+
+# 所有 get_*/read_* 都套上 profiled；设置 PROFILE_HOT_PATHS=1 启动时才记录耗时、缓存命中、返回大小和峰值内存
+@profiled(st.cache_resource(max_entries=64))
+def get_shared_table(name, version):
+    return open_segments(name, version)
+
+
+@profiled(st.cache_resource(max_entries=64))
+def get_shared_index(name, version):
+    return TableIndex.from_segments([
+        (open_table(segment, version), open_table(f"{segment}.groups", version).to_pandas())
+        for segment in segment_names(name, version)
+    ])
+
+
+@profiled()
+def read_shared(name, columns=None, meeting=None, years=None, status_not_null=False):
+    # 按 (meeting, year) 的组偏移直接切出映射表上的连续行，只有结果切片会转成 DataFrame
+    version = current_version()
+    if version is None and name in SNAPSHOT_TABLES:
+        return pd.read_csv(SNAPSHOT_TABLES[name], usecols=columns)
+    if meeting is None and years is None and not status_not_null:
+        table = get_shared_table(name, version)
+        table = table.select(columns) if columns is not None else table
+    else:
+        table = get_shared_index(name, version).select(meeting, years, columns, status_not_null)
+    frame = table.to_pandas()
+    frame.attrs["version"] = version
+    return frame
+
 
+def is_current(frame):
+    # 发布新版本后，基于旧版本的缓存在下一次命中时重新计算
+    return frame.attrs.get("version") == current_version()
 
-@st.cache_data(persist="disk",show_spinner=True)
-def read_data():
-    raw = pd.read_csv("data/raw.csv").replace(conf_name_map)
+
+def versioned(cache):
+    # 当前发布版本作为额外的参数进入缓存键：发布新版本后旧结果不再命中，由 max_entries 淘汰
+    def decorator(func):
+        @wraps(func)
+        def load(*args, version=None, **kwargs):
+            return func(*args, **kwargs)
+
+        cached = cache(load)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return cached(*args, version=current_version(), **kwargs)
+        return wrapper
+    return decorator
+
+
+# 相关性矩阵默认参与计算的属性
+CORR_ATTRIBUTES = [
+    "gs_citation", "rating_avg", "confidence_avg", "replies_avg", "authors#_avg", "correctness_avg",
+    "presentation_avg", "recommendation_avg", "technical_novelty_avg", "empirical_novelty_avg",
+    "soundness_avg", "contribution_avg"
+]
+# 合作网络默认每个机构保留的最强边数
+GRAPH_TOP_K = 5
+WORDCLOUD_CACHE_ENTRIES = 32
+# 趋势图可选的关键词为全库最常见的这么多个
+KEYWORD_OPTIONS = 500
+
+# 论文 × 属性热力图最多画多少列，所选区间的论文数超过该值时按年分段显示可用比例
+HEATMAP_MAX_COLUMNS = 2000
+
+
+# 只缓存映射表和组索引，每次调用现切一份；不会为每个滑块位置各留下一个 DataFrame
+@profiled()
+def read_data(columns=None, conf=None, years=None):
+    raw = read_shared("raw", columns, conf, years)
     return raw
 
-@st.cache_data(persist="disk",show_spinner=True)
-def read_numeric_data():
-    raw = pd.read_csv("data/numeric_raw.csv").replace(conf_name_map)
+@profiled()
+def read_numeric_data(columns=None, conf=None, years=None, status_not_null=False):
+    raw = read_shared("numeric_raw", columns, conf, years, status_not_null)
     return raw
 
-@st.cache_data(persist="disk",show_spinner=True)
+@profiled(versioned(st.cache_resource(show_spinner=True, max_entries=4)))
+def get_numeric_attributes(dropna=False):
+    # 与页面读取的数据同属一个发布版本，append.py 追加后随版本一起刷新
+    return tuple(table_numeric_columns(get_shared_table("numeric_raw", current_version()), dropna))
+
+@profiled(versioned(st.cache_resource(show_spinner=True, max_entries=2)))
 def read_available():
-    raw = pd.read_csv("data/available.csv", index_col=0)
+    if is_snapshot():
+        return pd.read_csv(SNAPSHOT_AVAILABLE_PATH, index_col=0)
+    raw = (
+        available_years(shared_path("availability"))
+        .assign(meeting=lambda x: x.meeting.map(conf_name_map), available=lambda x: x.year)
+        .pivot(index="meeting", columns="year", values="available")
+        .pipe(lambda x: x.reindex(
+            index=[conf for conf in conf_name_map.values() if conf in x.index],
+            columns=range(x.columns.min(), x.columns.max() + 1)
+        ))
+        .fillna(0)
+        .astype(int)
+        .rename_axis("Conference", axis="index")
+        .rename_axis(None, axis="columns")
+    )
     return raw
 
 
-@st.cache_data(persist="disk",show_spinner=True)
+@profiled(st.cache_resource(show_spinner=True, validate=is_current))
 def get_conf_time():
-    if not os.path.exists("./data/conf_time_data.csv"):
-        (
-            read_data()
-            .loc[:, ["year", "meeting"]]
-            .groupby("meeting")
-            .agg(["min", "max"])
-            .reset_index()
-            .replace(conf_name_map)
-            .set_index("meeting")
-            .pipe(lambda x: x.set_axis(x.columns.get_level_values(1), axis=1))
-            .to_csv("./data/conf_time_data.csv")
-        )
-    return pd.read_csv("./data/conf_time_data.csv",index_col=0)
+    return read_shared("conf_time").set_index("meeting")
+
+
+
+@profiled(st.cache_resource(show_spinner=True, validate=lambda catalog: catalog.version == current_version()))
+def get_catalog():
+    if is_snapshot():
+        return build_catalog(get_conf_time(), snapshot_available_years(), snapshot_wordcloud_years())
+    return build_catalog(
+        get_conf_time(), available_years(shared_path("availability")), keyword_years(get_keywords()), current_version()
+    )
+
+
+def snapshot_available_years():
+    # available.csv 里可用的格子填的是年份，不可用的是 0
+    return (
+        read_available()
+        .rename(index=reverse_conf_name_map)
+        .rename_axis("meeting", axis="index")
+        .melt(ignore_index=False, var_name="year", value_name="available")
+        .loc[lambda x: x.available > 0, :]
+        .reset_index()
+        .assign(year=lambda x: x.year.astype(int))
+        .loc[:, ["meeting", "year"]]
+    )
+
+
+def snapshot_wordcloud_years():
+    return (
+        pd.Series(sorted(os.listdir(SNAPSHOT_WORDCLOUD_DIR)), dtype=object)
+        .str.extract(r"^(?P<meeting>.+)_(?P<year>\d+)\.png$")
+        .dropna()
+        .astype({"year": int})
+        .groupby("meeting")
+        .year
+        .agg(lambda x: tuple(sorted(x)))
+        .to_dict()
+    )
+
+
+@profiled(versioned(st.cache_resource(show_spinner=True, max_entries=2)))
+def get_keywords():
+    return read_keywords(shared_path("keywords"))
+
+
+# 词云按需渲染，内存里最多留这么多张，超出时淘汰最久没用的
+@profiled(versioned(st.cache_data(show_spinner=True, max_entries=WORDCLOUD_CACHE_ENTRIES)))
+def get_wordcloud(conf, year):
+    if is_snapshot():
+        with open(os.path.join(SNAPSHOT_WORDCLOUD_DIR, f"{get_catalog()[conf].slug}_{year}.png"), "rb") as f:
+            return f.read()
+    frequencies = term_frequencies(get_keywords(), get_catalog()[conf].slug, year, WORDCLOUD_WORDS)
+    # 一个词都没有时 WordCloud 会报错
+    return render_wordcloud(frequencies) if len(frequencies) else None
+
+
+@profiled(versioned(st.cache_resource(show_spinner=True, max_entries=2)))
+def get_keyword_options(top=KEYWORD_OPTIONS):
+    return list(term_frequencies(get_keywords(), top=top).index)
+
+
+@profiled(versioned(st.cache_data(show_spinner=True, max_entries=64)))
+def get_keyword_trend_data(words, conf=None):
+    return keyword_trend(get_keywords(), list(words), get_catalog()[conf].slug if conf is not None else None)
 
 
-@st.cache_data(persist="disk",show_spinner=True)
+@profiled(st.cache_resource(show_spinner=True, validate=is_current))
 def get_sunburst_data():
-    if not os.path.exists("./data/sunburst_data.csv"):
-        (
-            pd
-            .DataFrame(read_data().loc[:, ["meeting", "status"]].value_counts())
-            .reset_index()
-            .rename(columns={0: "count"})
-            .replace(conf_name_map)
-            .to_csv("./data/sunburst_data.csv",index=False)
-        )
-    return pd.read_csv("./data/sunburst_data.csv",)
+    return read_shared("sunburst")
+
 
 
-@st.cache_data(persist="disk",show_spinner=True)
+@profiled(st.cache_resource(show_spinner=True, validate=is_current))
 def get_count_data():
-    if not os.path.exists("./data/count_data.csv"):
-        (
-            read_data()
-            .loc[:, ["meeting", "year"]]
-            .value_counts()
-            .reset_index()
-            .rename(columns={0: "count"})
-            .replace(conf_name_map)
-            .assign(year=lambda x: x.year.astype(str))
-            .rename(columns={"meeting": "Conference", "year": "Year", "count": "Count"})
-            .to_csv("./data/count_data.csv",index=False)
-        )
-    return pd.read_csv("./data/count_data.csv")
+    return read_shared("count")
+
 
 
-@st.cache_data(persist="disk",show_spinner=True)
+@profiled(FIGURE_CACHE)
 def get_sunburst_fig():
     fig = px.sunburst(
         get_sunburst_data(),
@@ -136,7 +263,7 @@ def get_sunburst_fig():
     return fig
 
 
-@st.cache_data(persist="disk",show_spinner=True)
+@profiled(FIGURE_CACHE)
 def get_available_fig():
     data = read_available()
 
@@ -188,24 +315,18 @@ def get_available_fig():
     return fig
 
 
-@st.cache_data(persist="disk",show_spinner=True)
+@profiled(versioned(st.cache_data(show_spinner=True, max_entries=2)))
 def get_attribute_data():
-    if not os.path.exists("./data/attribute_data.csv"):
-        (
-            read_data()
-            .notna()
-            .assign(meeting=raw.meeting)
-            .groupby("meeting")
-            .mean()
-            .rename(index=conf_name_map)
-            .rename_axis("Attribute", axis="columns")
-            .rename_axis("Conference", axis="index")
-            .to_csv("./data/attribute_data.csv")
-        )
-    return pd.read_csv("./data/attribute_data.csv",index_col=0)
+    return (
+        (pd.read_csv(SNAPSHOT_ATTRIBUTE_PATH, index_col=0) if is_snapshot() else attribute_ratio(shared_path("availability")))
+        .rename(index=conf_name_map)
+        .sort_index()
+        .rename_axis("Attribute", axis="columns")
+        .rename_axis("Conference", axis="index")
+    )
 
 
-@st.cache_data(persist="disk",show_spinner=True)
+@profiled(FIGURE_CACHE)
 def get_attribute_fig():
     fig = px.imshow(
         get_attribute_data(),
@@ -232,42 +353,64 @@ def get_attribute_fig():
     return fig
 
 
-@st.cache_data(persist="disk",show_spinner=True)
+@profiled(versioned(st.cache_data(show_spinner=True, max_entries=64)))
 def get_conf_attribute_data(conf, start, end):
-    if not os.path.exists("./data/attribute_available.csv"):
-        (
-            pd
-                .read_csv("./data/raw.csv")
-                # .loc[lambda df:(df.meeting == conf) & (df.year.between(start, end)), :]
-                .sort_values(by="year")
-                .reset_index(drop=True)
-                .dropna(axis=1, how="all")
-                .apply(lambda row: row.mask(row.notna(), int(row.year)), axis=1)
-                .apply(lambda row: row.mask(lambda x: x != row.year, np.inf), axis=1)
-                .assign(raw_meeting=pd.read_csv("./data/raw.csv").meeting)
-                .assign(raw_year=pd.read_csv("./data/raw.csv").year)
-                .astype("category")
-                .to_csv("./data/attribute_available.csv",index=False)
-        )
-    return (
-            pd.read_csv("./data/attribute_available.csv")
-            .replace(conf_name_map)
-            .loc[lambda df:(df.raw_meeting == conf) & (df.raw_year.between(start, end)), :]
-            .drop(["raw_meeting","raw_year"],axis=1)
-            .T
-        )
+    return conf_availability(reverse_conf_name_map[conf], start, end, shared_path("availability"))
+
+
+@profiled(versioned(st.cache_data(show_spinner=True, max_entries=64)))
+def get_conf_attribute_binned_data(conf, start, end, buckets_per_year):
+    # 比例保留三位小数即可，减小发往浏览器的数据量
+    return conf_availability_binned(
+        reverse_conf_name_map[conf], start, end, buckets_per_year, shared_path("availability")
+    ).round(3)
 
 
-@st.cache_data(persist="disk",show_spinner=True)
+@profiled()
+def get_conf_paper_count(conf, start, end):
+    return get_count_data().loc[lambda x: (x.Conference == conf) & x.Year.between(start, end), "Count"].sum()
+
+
+@profiled(FIGURE_CACHE)
 def get_conf_attribute_fig(conf, start, end):
-    data = get_conf_attribute_data(conf, start, end)
-    fig = px.imshow(data, template="plotly_dark")
-    fig.update_coloraxes(
-        colorbar=dict(
-            title="Available Data",
-            ticks="outside"
+    # 区间足够窄时逐篇显示，否则每年最多 HEATMAP_MAX_COLUMNS / 年数 段
+    if get_conf_paper_count(conf, start, end) <= HEATMAP_MAX_COLUMNS:
+        data = get_conf_attribute_data(conf, start, end)
+        fig = px.imshow(data, template="plotly_dark")
+        fig.update_coloraxes(
+            colorbar=dict(
+                title="Available Data",
+                ticks="outside"
+            )
+        )
+    else:
+        data = get_conf_attribute_binned_data(conf, start, end, max(1, HEATMAP_MAX_COLUMNS // (end - start + 1)))
+        fig = px.imshow(
+            data,
+            color_continuous_scale=[
+                [0.0, "black"],
+                [1.0, "white"]
+            ],
+            zmin=0,
+            zmax=1,
+            aspect="auto",
+            template="plotly_dark"
+        )
+        # 每年只在第一段处标注年份
+        years = data.columns.str.split(" ").str[0]
+        firsts = data.columns[~years.duplicated()]
+        fig.update_xaxes(
+            tickmode="array",
+            tickvals=list(firsts),
+            ticktext=list(years[~years.duplicated()])
+        )
+        fig.update_coloraxes(
+            colorbar=dict(
+                title="Availability",
+                tickformat=".0%",
+                ticks="outside"
+            )
         )
-    )
     fig.update_layout(
         width=1200,
         height=800
@@ -275,14 +418,26 @@ def get_conf_attribute_fig(conf, start, end):
     return fig
 
 
-@st.cache_data(persist="disk",show_spinner=True)
+@profiled(versioned(st.cache_resource(show_spinner=True, max_entries=64)))
+def get_conf_corr(conf):
+    return read_correlations(reverse_conf_name_map[conf], shared_path("correlations"))
+
+
+@profiled()
 def get_corr_data(conf, options):
-    return read_numeric_data().loc[lambda x: x.meeting == conf, options].corr()
+    # 全量矩阵按会议缓存，任意属性组合只是切片
+    corr, pairs = get_conf_corr(conf)
+    return corr.reindex(index=options, columns=options), pairs.reindex(index=options, columns=options)
 
 
-@st.cache_data(persist="disk",show_spinner=True)
+@profiled(FIGURE_CACHE)
 def get_corr_fig(conf, options):
-    fig = px.imshow(get_corr_data(conf, options), template="plotly_dark")
+    corr, pairs = get_corr_data(conf, list(options))
+    fig = px.imshow(corr, template="plotly_dark")
+    fig.update_traces(
+        customdata=pairs.to_numpy(),
+        hovertemplate="%{x}<br>%{y}<br>Correlation: %{z:.3f}<br>Pairs: %{customdata}<extra></extra>"
+    )
     fig.update_coloraxes(
         cmin=0,  # 最小值为 0
         cmax=1,  # 最大值为 1
@@ -298,249 +453,141 @@ def get_corr_fig(conf, options):
     return fig
 
 
-@st.cache_data(persist="disk",show_spinner=True)
+def violin_fig(data, x, y, hover, points="outliers"):
+    if SUMMARY_VIOLINS:
+        fig = summary_violin(data, x, y, hover, points=bool(points))
+    else:
+        fig = px.violin(
+            data,
+            x=x,  # x轴：离散变量（建议是有限个值）
+            y=y,  # y轴：数值型变量
+            points=points,
+            hover_data=[hover],
+            box=True,  # 显示箱线
+            template="plotly_dark",
+            color=x
+        )
+        for trace in fig.data:
+            if trace.type == 'violin' and points:  # 只改散点部分
+                trace.jitter = 0.5
+                trace.marker.size = 4
+                trace.pointpos = 0  # 点在箱线中线位置附近抖动
+    fig.update_layout(
+        width=1200,
+        height=800
+    )
+    return fig
+
+
+@profiled(versioned(st.cache_data(show_spinner=True, max_entries=64)))
 def get_violin_data(conf, attribute, begin_year, end_year):
     return (
-            read_numeric_data()
-            .loc[
-                lambda x: (x.meeting == conf) & (x.year.between(begin_year, end_year)) & (x.status.notna()),
-                ["status","title"] + [attribute]
-            ]
+            read_numeric_data(["status","title"] + [attribute], conf, (begin_year, end_year), status_not_null=True)
             .rename(columns={"status":"Status","title":"Title"})
         )
 
 
-@st.cache_data(persist="disk",show_spinner=True)
+@profiled(FIGURE_CACHE)
 def get_violin_fig(conf, attribute, begin_year, end_year):
-    fig = px.violin(
+    return violin_fig(
         get_violin_data(conf, attribute, begin_year, end_year).rename(columns={attribute: f"Value of {attribute}"}),
         x="Status",
         y=f"Value of {attribute}",
-        color="Status",
-        hover_data="Title",
-        box=True,
-        points="outliers",
-        template="plotly_dark"
-    )
-    fig.update_layout(
-        width=1200,
-        height=800
+        hover="Title"
     )
-    for trace in fig.data:
-        if trace.type == 'violin':  # 只改散点部分
-            trace.jitter = 0.5
-            trace.marker.size = 4
-            trace.pointpos = 0  # 点在箱线中线位置附近抖动
-    return fig
 
 
-@st.cache_data(persist="disk",show_spinner=True)
+@profiled(FIGURE_CACHE)
 def get_unique_meeting_fig():
-    fig = px.violin(
-        pd
-        .read_csv("./data/first_author_info.csv")
-        .groupby(["elapsed", "author"])
-        .meeting_unique_count_upto_elapsed
-        .unique()
-        .explode()
-        .reset_index()
-        .assign(elapsed=lambda x: x.elapsed.astype(str))
-        .replace(conf_name_map)
-        .rename(columns={"elapsed": "Years Since First Publication",
-                         "meeting_unique_count_upto_elapsed": "Number of Distinct Conferences Published In",
-                         "author": "Author"}),
-        x='Years Since First Publication',  # x轴：离散变量（建议是有限个值）
-        y='Number of Distinct Conferences Published In',  # y轴：数值型变量
-        points="outliers",  # 显示所有数据点
-        hover_data=['Author'],  # 鼠标悬停显示作者
-        box=True,  # 显示箱线
-        template='plotly_dark',
-        color="Years Since First Publication",
-    )
-    fig.update_layout(
-        width=1200,
-        height=800
+    return violin_fig(
+        read_shared("unique_meeting"),
+        x='Years Since First Publication',
+        y='Number of Distinct Conferences Published In',
+        hover='Author'
     )
-    for trace in fig.data:
-        if trace.type == 'violin':  # 只改散点部分
-            trace.jitter = 0.5
-            trace.marker.size = 4
-            trace.pointpos = 0  # 点在箱线中线位置附近抖动
-    return fig
 
 
-@st.cache_data(persist="disk",show_spinner=True)
+@profiled(FIGURE_CACHE)
 def get_annual_paper_fig():
-    fig = px.violin(
-        pd
-        .read_csv("./data/first_author_info.csv")
-        .groupby(["author", "elapsed"])
-        .apply(lambda x: len(x))
-        .reset_index()
-        .rename(columns={0: "Annual Paper Count", "author": "Author", "elapsed": "Years Since First Publication"}),
-        x='Years Since First Publication',  # x轴：离散变量（建议是有限个值）
-        y='Annual Paper Count',  # y轴：数值型变量
-        points="outliers",  # 显示所有数据点
-        hover_data=['Author'],  # 鼠标悬停显示作者
-        box=True,  # 显示箱线
-        template='plotly_dark',
-        color="Years Since First Publication"
+    return violin_fig(
+        read_shared("annual_paper"),
+        x='Years Since First Publication',
+        y='Annual Paper Count',
+        hover='Author'
     )
-    fig.update_layout(
-        width=1200,
-        height=800
-    )
-    for trace in fig.data:
-        if trace.type == 'violin':  # 只改散点部分
-            trace.jitter = 0.5
-            trace.marker.size = 4
-            trace.pointpos = 0  # 点在箱线中线位置附近抖动
-    return fig
 
 
-@st.cache_data(persist="disk",show_spinner=True)
+@profiled(FIGURE_CACHE)
 def get_paper_count_fig():
-    fig = px.violin(
-        pd
-        .read_csv("./data/first_author_info.csv")
-        .groupby(["year", "author"])
-        .paper_count
-        .unique()
-        .explode()
-        .reset_index()
-        .assign(year=lambda x: x.year.astype(str))
-        .replace(conf_name_map)
-        .rename(columns={"year": "Year","paper_count":"Annual Paper Count", "author": "Author"}),
-        x='Year',  # x轴：离散变量（建议是有限个值）
-        y='Annual Paper Count',  # y轴：数值型变量
-        points="outliers",  # 显示所有数据点
-        hover_data=['Author'],  # 鼠标悬停显示作者
-        box=True,  # 显示箱线
-        template='plotly_dark',
-        color="Year"
+    return violin_fig(
+        read_shared("paper_count"),
+        x='Year',
+        y='Annual Paper Count',
+        hover='Author'
     )
-    fig.update_layout(
-        width=1200,
-        height=800
-    )
-    for trace in fig.data:
-        if trace.type == 'violin':  # 只改散点部分
-            trace.jitter = 0.5
-            trace.marker.size = 4
-            trace.pointpos = 0  # 点在箱线中线位置附近抖动
-    return fig
 
 
-@st.cache_data(persist="disk",show_spinner=True)
+@profiled(FIGURE_CACHE)
 def get_interval_fig():
-    fig = px.violin(
-        pd
-        .read_csv("./data/author_info.csv")
-        .groupby(["meeting", "author"])
+    return violin_fig(
+        read_shared("author_info")
+        .groupby(["meeting", "author"], observed=True)
         .interval
         .unique()
         .explode()
         .reset_index()
-        .replace(conf_name_map)
         .rename(columns={"meeting": "Conference",
                          "interval": "Years Between First Publication and First First-Author Paper",
                          "author": "Author"}),
-        x='Conference',  # x轴：离散变量（建议是有限个值）
-        y='Years Between First Publication and First First-Author Paper',  # y轴：数值型变量
-        points=False,  # 显示所有数据点
-        hover_data=['Author'],  # 鼠标悬停显示作者
-        box=True,  # 显示箱线
-        template='plotly_dark',
-        color="Conference"
+        x='Conference',
+        y='Years Between First Publication and First First-Author Paper',
+        hover='Author',
+        points=False
     )
-    fig.update_layout(
-        width=1200,
-        height=800
-    )
-    return fig
 
 
-@st.cache_data(persist="disk",show_spinner=True)
+@profiled(FIGURE_CACHE)
 def get_author_number_fig():
-    if not os.path.exists("./data/author_number.csv"):
-        (
-            read_data()
-            .assign(author_number=lambda x: x.author.map(lambda s: len(
-                sum([ss.split(';') for ss in (s.split(',') if not isinstance(s, float) else [])], []))))
-            .replace(conf_name_map)
-            .rename(columns={"meeting": "Conference", "title": "Title","author_number":"Number of Authors per Paper"})
-            .loc[:,["Conference","Title","Number of Authors per Paper"]]
-            .to_csv("./data/author_number.csv",index=False)
-        )
-
-    fig = px.violin(
-        pd.read_csv("./data/author_number.csv"),
-        x='Conference',  # x轴：离散变量（建议是有限个值）
-        y='Number of Authors per Paper',  # y轴：数值型变量
-        points="outliers",  # 显示所有数据点
-        hover_data=['Title'],  # 鼠标悬停显示作者
-        box=True,  # 显示箱线
-        template='plotly_dark',
-        color="Conference"
-    )
-    fig.update_layout(
-        width=1200,
-        height=800
+    return violin_fig(
+        read_shared("author_number"),
+        x='Conference',
+        y='Number of Authors per Paper',
+        hover='Title'
     )
-    for trace in fig.data:
-        if trace.type == 'violin':  # 只改散点部分
-            trace.jitter = 0.5
-            trace.marker.size = 4
-            trace.pointpos = 0  # 点在
-    return fig
 
 
-@st.cache_data(persist="disk",show_spinner=True)
+@profiled(st.cache_resource(show_spinner=True, validate=is_current))
 def get_author_number_data():
-    if not os.path.exists("./data/author_number_data.csv"):
-        (
-            read_data()
-            .assign(author_number=lambda x: x.author.map(
-                lambda s: len(sum([ss.split(';') for ss in (s.split(',') if not isinstance(s, float) else [])], []))))
-            .loc[lambda x: x.author_number > 0, :]
-            .groupby(["meeting", "year"])
-            .author_number
-            .mean()
-            .reset_index()
-            .replace(conf_name_map)
-            .rename(columns={"meeting": "Conference", "author_number": "Average Number of Co-authors per Paper","year": "Year"})
-            .loc[:,["Conference","Average Number of Co-authors per Paper","Year"]]
-            .to_csv("./data/author_number_data.csv",index=False)
-        )
-    return pd.read_csv("./data/author_number_data.csv")
+    return read_shared("author_number_data")
 
 
-@st.cache_data(persist="disk",show_spinner=True)
-def get_paper_count_data():
-    return (
-        pd
-        .read_csv("./data/first_author_info.csv")
-        .assign(count_=lambda x: x.groupby(["year", "author", "meeting"]).paper_count.transform("count"))
-        .groupby(["year", "meeting"])
-        .count_
-        .mean()
-        .reset_index()
-        .replace(conf_name_map)
-    )
 
-@st.cache_data(persist="disk",show_spinner=True)
-def get_graph_data():
-    return (pd.read_csv("./data/adjmat_greater_than_50.csv"),pd.read_csv("./data/node_info.csv",index_col=0))
-
-@st.cache_data(persist="disk",show_spinner=True)
-def get_collaborate_graph():
-    if not os.path.exists("./data/graph.html"):
-        vec, node_info = get_graph_data()
-        D3 = d3graph()
-        adjmat = vec2adjmat(vec.source, vec.target, vec.weight)
-        D3.graph(adjmat=adjmat, size=node_info.loc[adjmat.index, "count"].tolist())
-        D3.set_edge_properties(directed=True, marker_end='arrow')
-        with open("./data/graph.html","w") as f:
-            f.write(D3.show(filepath=None))
-    with open("./data/graph.html","r") as f:
-        return f.read()
\ No newline at end of file
+@profiled(st.cache_resource(show_spinner=True, validate=is_current))
+def get_paper_count_data():
+    return read_shared("paper_count_data")
+
+@profiled(versioned(st.cache_resource(show_spinner=True, max_entries=64)))
+def get_network(conf=None):
+    return read_affiliations(reverse_conf_name_map[conf] if conf is not None else None, out_dir=shared_path("affiliations"))
+
+
+@profiled(versioned(st.cache_resource(show_spinner=True, max_entries=64)))
+def get_graph_options(conf=None):
+    if is_snapshot():
+        # 快照里只有全部机构的整张图，没有可选的中心机构
+        return [], 0
+    # 只有至少一条边的机构才可以作为中心，按发表数从多到少排列
+    network = get_network(conf)
+    linked = (network.weights.getnnz(axis=0) + network.weights.getnnz(axis=1)) > 0
+    order = np.argsort(-network.counts[linked], kind="stable")
+    return list(network.names[linked][order]), int(network.weights.max()) if network.weights.nnz else 0
+
+
+@profiled(FIGURE_CACHE.text)
+def get_collaborate_graph(threshold=0, top_k=GRAPH_TOP_K, center=None, hops=1, conf=None):
+    if is_snapshot() and conf is None:
+        # 快照是固定阈值下全部机构的整张图，筛选条件不起作用
+        with open(SNAPSHOT_GRAPH_PATH) as f:
+            return f.read()
+    edges = subgraph(get_network(conf), threshold, top_k, center, hops)
+    return render(get_network(conf), edges) if len(edges) else None
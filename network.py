@@ -0,0 +1,71 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from d3graph import d3graph, vec2adjmat
+from scipy import sparse
+
+# 无论全图多大，发给浏览器的子图最多保留这么多条边（按权重取最大的）
+MAX_EDGES = 500
+
+# names[i] 为第 i 个机构，counts[i] 为它的论文数，weights 上三角的 (i, j) 为两家机构合作的论文数
+Network = namedtuple("Network", ["names", "counts", "weights"])
+
+
+def ego_nodes(weights, center, hops):
+    # 不考虑方向，从 center 出发做 hops 步宽度优先扩展；
+    # 直接取前沿各行的列下标作为邻居，不做矩阵乘法，邻居再多也不会在计数上溢出
+    linked = ((weights + weights.T) > 0).tocsr()
+    reached = np.zeros(weights.shape[0], dtype=bool)
+    reached[center] = True
+    frontier = reached.copy()
+    for _ in range(hops):
+        neighbours = np.zeros_like(reached)
+        neighbours[linked[np.flatnonzero(frontier)].indices] = True
+        frontier = neighbours & ~reached
+        if not frontier.any():
+            break
+        reached |= frontier
+    return np.flatnonzero(reached)
+
+
+def top_k_edges(edges, k):
+    # 一条边只要在任一端点的前 k 大之内就保留；边只存了上三角，两个方向都展开后按节点在它的全部边里排名
+    both = pd.concat([edges, edges.rename(columns={"source": "target", "target": "source"})])
+    rank = both.groupby("source").weight.rank(method="first", ascending=False)
+    keep = rank.le(k).groupby(level=0).any()
+    return edges.loc[keep.reindex(edges.index).to_numpy(), :]
+
+
+def subgraph(network, threshold=0, top_k=None, center=None, hops=1, max_edges=MAX_EDGES):
+    weights = network.weights.copy()
+    weights.data[weights.data < threshold] = 0
+    weights.eliminate_zeros()
+    if center is not None:
+        keep = np.zeros(weights.shape[0], dtype=bool)
+        keep[ego_nodes(weights, network.names.get_loc(center), hops)] = True
+        weights = sparse.diags(keep.astype(np.float64)) @ weights @ sparse.diags(keep.astype(np.float64))
+        weights.eliminate_zeros()
+
+    coo = weights.tocoo()
+    edges = pd.DataFrame({"source": coo.row, "target": coo.col, "weight": coo.data})
+    if top_k is not None:
+        edges = top_k_edges(edges, top_k)
+    # vec2adjmat 按位置对齐 source/target 和 weight，索引必须是从 0 开始的连续编号
+    edges = edges.nlargest(max_edges, "weight", keep="first").reset_index(drop=True)
+    return edges.assign(
+        source=network.names[edges.source.to_numpy()],
+        target=network.names[edges.target.to_numpy()],
+        weight=edges.weight.astype(np.int64),
+    )
+
+
+def render(network, edges):
+    # d3graph 会原地修改它拿到的数组，给它一份自己的副本，不碰调用方的表
+    edges = edges.copy()
+    D3 = d3graph()
+    adjmat = vec2adjmat(edges.source, edges.target, edges.weight)
+    D3.graph(adjmat=adjmat)
+    # d3graph 会去掉部分节点，节点大小要按它保留下来的节点对齐
+    D3.set_node_properties(size=network.counts[network.names.get_indexer(D3.adjmat.index)].tolist())
+    return D3.show(filepath=None, showfig=False)
@@ -1,46 +1,92 @@
 import streamlit as st
-import pandas as pd
-import sys
-import os
-import re
-from glob import glob
 from lib import (
-    conf_name_map,
-    reverse_conf_name_map
+    get_catalog,
+    get_wordcloud,
+    get_keyword_options,
+    get_keyword_trend_data,
+    requires_build
 )
-import os
+from profiling import page_run
+from warmup import start_warm_up
 
 st.set_page_config(
     layout="wide",
     page_title="Topic🤯"
 )
+page_run("Topic")
+start_warm_up()
 st.title("Topic🤯")
 
 st.header("Keyword Trends in Conference Papers Over the Years",divider="orange")
-col1, col2 = st.columns([4, 1])
-with col2:
-    select_conf = st.selectbox(
-        "Select a conference to show",
-        conf_name_map.values(),
-        key="wordcloud_selectbox"
-    )
-with col1:
-    years = [
-        int(re.search(r'\d{4}', fig).group())
-        for fig
-        in glob(os.path.join(os.curdir, "data", "wordcloud", f"*{reverse_conf_name_map[select_conf]}*"))
-    ]
-    years.sort()
-
-    if len(years) >1:
-        year = st.select_slider(
-            "Select a year to show",
-            options = years
+
+
+@st.fragment
+def wordcloud_section():
+    col1, col2 = st.columns([4, 1])
+    with col2:
+        select_conf = st.selectbox(
+            "Select a conference to show",
+            get_catalog().names,
+            key="wordcloud_selectbox"
         )
-    else:
-        year = years[0]
-        st.text(f"Displaying wordcloud of {years[0]}")
-    st.image(os.path.join(os.curdir,"data","wordcloud",f"{reverse_conf_name_map[select_conf]}_{year}.png"))
+    with col1:
+        years = get_catalog()[select_conf].wordcloud_years
+
+        if not years:
+            st.info("No papers with titles or abstracts for this conference")
+            return
+        if len(years) >1:
+            year = st.select_slider(
+                "Select a year to show",
+                options = years
+            )
+        else:
+            year = years[0]
+            st.text(f"Displaying wordcloud of {years[0]}")
+        image = get_wordcloud(select_conf, year)
+        if image is None:
+            st.info("No keywords indexed for this conference and year")
+        else:
+            st.image(image)
+
+
+wordcloud_section()
 
 st.divider()
 
+st.header("Share of Papers Mentioning a Keyword",divider="orange")
+
+
+@st.fragment
+@requires_build()
+def keyword_trend_section():
+    col1, col2 = st.columns([4, 1])
+    with col2:
+        words = st.multiselect(
+            "Select keywords to show",
+            get_keyword_options(),
+            default=get_keyword_options()[:3],
+            key="keyword_trend_multiselectbox"
+        )
+        conf = st.selectbox(
+            "Select a conference to show",
+            get_catalog().names,
+            index=None,
+            placeholder="All conferences",
+            key="keyword_trend_conf_selectbox"
+        )
+    with col1:
+        if not words:
+            st.info("Select at least one keyword")
+            return
+        st.line_chart(
+            get_keyword_trend_data(tuple(words), conf).melt(id_vars="Year", var_name="Keyword", value_name="Share of Papers"),
+            x="Year",
+            y="Share of Papers",
+            color="Keyword",
+            height=600,
+        )
+
+
+keyword_trend_section()
+st.divider()
@@ -1,42 +1,54 @@
 import streamlit as st
-import pandas as pd
-import sys
-import os
 import streamlit.components.v1 as components
 from lib import (
-    conf_name_map,
+    get_catalog,
     get_author_number_fig,
     get_author_number_data,
-    get_graph_data, get_collaborate_graph
+    get_collaborate_graph,
+    get_graph_options,
+    GRAPH_TOP_K,
+    requires_build
 )
+from profiling import page_run
+from warmup import start_warm_up
 
 st.set_page_config(
     layout="wide",
     page_title="Collaboration🤝"
 )
+page_run("Collaboration")
+start_warm_up()
 st.title("Collaboration🤝")
 
 st.header("Authorship Distribution Across Conferences",divider="orange")
-st.plotly_chart(get_author_number_fig())
+with requires_build():
+    st.plotly_chart(get_author_number_fig())
 st.divider()
 
 st.header("Trends in Average Collaboration Size Across Conferences",divider="orange")
-col1, col2 = st.columns([4, 1])
-with col2:
-    options = st.multiselect(
-        "Select conference to show",
-        list(conf_name_map.values()),
-        default=list(conf_name_map.values()),
-        key="author_number_multiselectbox"
-    )
-with col1:
-    st.line_chart(
-        get_author_number_data().loc[lambda x: x.Conference.isin(options), :],
-        x="Year",
-        y="Average Number of Co-authors per Paper",
-        color="Conference",
-        height=800,
-    )
+
+
+@st.fragment
+def author_number_section():
+    col1, col2 = st.columns([4, 1])
+    with col2:
+        options = st.multiselect(
+            "Select conference to show",
+            get_catalog().names,
+            default=get_catalog().names,
+            key="author_number_multiselectbox"
+        )
+    with col1:
+        st.line_chart(
+            get_author_number_data().loc[lambda x: x.Conference.isin(options), :],
+            x="Year",
+            y="Average Number of Co-authors per Paper",
+            color="Conference",
+            height=800,
+        )
+
+
+author_number_section()
 st.divider()
 
 
@@ -55,5 +67,57 @@ st.divider()
 
 # Initialize
 st.header("Collaboration Network of Research Institutions",divider="orange")
-components.html(get_collaborate_graph(),height=1200)
+
+
+@st.fragment
+@requires_build()
+def collaborate_graph_section():
+    col1, col2 = st.columns([4, 1])
+    with col2:
+        conf = st.selectbox(
+            "Select a conference to show",
+            get_catalog().names,
+            index=None,
+            placeholder="All conferences",
+            key="graph_conf_selectbox"
+        )
+        institutions, max_weight = get_graph_options(conf)
+        threshold = st.slider(
+            "Minimum number of collaborations",
+            0,
+            max(max_weight, 1),
+            0,
+            key="graph_threshold_slider"
+        )
+        top_k = st.number_input(
+            "Strongest links kept per institution",
+            min_value=1,
+            max_value=50,
+            value=GRAPH_TOP_K,
+            key="graph_top_k_input"
+        )
+        center = st.selectbox(
+            "Focus on an institution",
+            institutions,
+            index=None,
+            placeholder="All institutions",
+            key="graph_center_selectbox"
+        )
+        hops = st.slider(
+            "Neighbourhood depth",
+            1,
+            3,
+            1,
+            disabled=center is None,
+            key="graph_hops_slider"
+        )
+    with col1:
+        graph = get_collaborate_graph(threshold, top_k, center, hops, conf)
+        if graph is None:
+            st.info("No collaborations match the selected filters")
+        else:
+            components.html(graph, height=1200)
+
+
+collaborate_graph_section()
 st.divider()
@@ -0,0 +1,204 @@
+import atexit
+import itertools
+import json
+import os
+import pickle
+import threading
+import time
+import tracemalloc
+from collections import deque
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# 设置环境变量 PROFILE_HOT_PATHS=1 才开启；关闭时 profiled 原样返回被装饰的函数，调用路径上没有任何额外代码
+ENABLED = os.environ.get("PROFILE_HOT_PATHS") == "1"
+PROFILE_PATH = "./data/profile.json"
+# 内存里最多保留最近这么多次页面运行的记录
+MAX_RUNS = 200
+
+_lock = threading.Lock()
+_local = threading.local()
+_counter = itertools.count(1)
+_runs = deque(maxlen=MAX_RUNS)
+# 每个会话当前所在的页面运行；fragment 单独重跑时记到它所在页面最近一次运行下
+_current = {}
+
+if ENABLED:
+    # tracemalloc 本身会让分配变慢，只在开启时启动；多个会话并发时峰值会互相叠加，只能作参考
+    tracemalloc.start()
+
+
+def payload_bytes(result, deep=True):
+    # 图按发给浏览器的 JSON 计，表按内存占用计，其余按序列化后的大小计
+    if isinstance(result, go.Figure):
+        return len(result.to_json())
+    if isinstance(result, (pd.DataFrame, pd.Series)):
+        return int(np.sum(result.memory_usage(deep=deep)))
+    if isinstance(result, str):
+        return len(result.encode())
+    if isinstance(result, bytes):
+        return len(result)
+    return len(pickle.dumps(result))
+
+
+def _session():
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return (ctx.session_id, ctx.current_fragment_id) if ctx is not None else ("bare", None)
+
+
+def page_run(page):
+    # 每个页面脚本开头调用一次，之后的调用都归到这次运行下
+    if not ENABLED:
+        return
+    session, _ = _session()
+    run = {"run": next(_counter), "session": session, "page": page, "started_at": time.time(), "calls": []}
+    with _lock:
+        _current.pop(session, None)
+        _current[session] = run
+        if len(_current) > MAX_RUNS:
+            _current.pop(next(iter(_current)))
+        _runs.append(run)
+
+
+def _record(call):
+    session, fragment = _session()
+    with _lock:
+        run = _current.get(session)
+        if run is None:
+            # 不经页面直接调用（warmup、benchmark 等）时，按会话记一次匿名运行
+            run = _current[session] = {
+                "run": next(_counter), "session": session, "page": None, "started_at": time.time(), "calls": []
+            }
+            _runs.append(run)
+        run["calls"].append(dict(call, fragment=fragment))
+
+
+def profiled(cache=None):
+    # cache 为该函数原本的缓存装饰器；开启时在缓存内外各包一层，内层被执行说明没有命中
+    def decorator(func):
+        if not ENABLED:
+            return cache(func) if cache is not None else func
+
+        @wraps(func)
+        def executed(*args, **kwargs):
+            _local.stack[-1]["hit"] = False
+            return func(*args, **kwargs)
+
+        cached = cache(executed) if cache is not None else func
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            stack = _local.__dict__.setdefault("stack", [])
+            # 嵌套调用会重置峰值，先把外层到目前为止的峰值记下来
+            if stack:
+                stack[-1]["peak"] = max(stack[-1]["peak"], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            frame = {"hit": True if cache is not None else None, "peak": before}
+            stack.append(frame)
+            start = time.perf_counter()
+            result, error = None, None
+            try:
+                result = cached(*args, **kwargs)
+                return result
+            except Exception as e:
+                error = repr(e)
+                raise
+            finally:
+                seconds = time.perf_counter() - start
+                stack.pop()
+                peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+                if stack:
+                    stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+                _record({
+                    "function": func.__name__,
+                    "depth": len(stack),
+                    "seconds": seconds,
+                    "hit": frame["hit"],
+                    # 表只算列数组本身，不逐个统计字符串，免得每次命中都遍历一遍对象列
+                    "bytes": payload_bytes(result, deep=False) if error is None else None,
+                    "peak_bytes": peak - before,
+                    "error": error,
+                })
+        return wrapper
+    return decorator
+
+
+def runs():
+    with _lock:
+        return [dict(run, calls=list(run["calls"])) for run in _runs]
+
+
+def calls(recorded=None):
+    recorded = runs() if recorded is None else recorded
+    return pd.DataFrame(
+        [dict(call, run=run["run"], page=run["page"]) for run in recorded for call in run["calls"]],
+        columns=["run", "page", "fragment", "function", "depth", "seconds", "hit", "bytes", "peak_bytes", "error"],
+    )
+
+
+def per_run(frame):
+    # 只汇总最外层调用，嵌套调用的耗时已经包含在外层里
+    return (
+        frame
+        .loc[frame.depth == 0, :]
+        .groupby(["run", "page"], dropna=False)
+        .agg(
+            calls=("function", "size"),
+            seconds=("seconds", "sum"),
+            misses=("hit", lambda x: int(x.eq(False).sum())),
+            bytes=("bytes", "sum"),
+            peak_bytes=("peak_bytes", "max"),
+        )
+        .reset_index()
+        .sort_values("run", ascending=False)
+    )
+
+
+def per_function(frame):
+    return (
+        frame
+        .groupby("function")
+        .agg(
+            calls=("seconds", "size"),
+            hits=("hit", lambda x: int(x.eq(True).sum())),
+            misses=("hit", lambda x: int(x.eq(False).sum())),
+            total_seconds=("seconds", "sum"),
+            mean_seconds=("seconds", "mean"),
+            max_seconds=("seconds", "max"),
+            mean_bytes=("bytes", "mean"),
+            max_peak_bytes=("peak_bytes", "max"),
+            errors=("error", "count"),
+        )
+        .reset_index()
+        .sort_values("total_seconds", ascending=False)
+    )
+
+
+def snapshot(extra=None):
+    recorded = runs()
+    frame = calls(recorded)
+    return dict(
+        enabled=ENABLED,
+        generated_at=time.time(),
+        functions=per_function(frame).to_dict("records"),
+        page_runs=per_run(frame).to_dict("records"),
+        runs=recorded,
+        **(extra or {}),
+    )
+
+
+def dump(path=PROFILE_PATH, extra=None):
+    with open(path + ".tmp", "w") as f:
+        json.dump(snapshot(extra), f, indent=2, default=str)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+if ENABLED:
+    # 进程退出时留一份完整记录，脱离页面运行（warmup、benchmark）时也能拿到
+    atexit.register(dump)
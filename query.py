@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+GROUP_KEYS = ["meeting", "year"]
+STATUS = "status"
+
+
+def sort_for_index(table):
+    # 按 (meeting, year) 排序，每组内 status 非空的行排在前面，这样两种查询都只取连续的行
+    keys = [(key, "ascending") for key in GROUP_KEYS]
+    if STATUS in table.column_names:
+        table = table.append_column("_status_null", pc.is_null(table[STATUS]))
+        keys.append(("_status_null", "ascending"))
+    order = pc.sort_indices(table, sort_keys=keys)
+    return table.take(order).drop_columns([name for name in ["_status_null"] if name in table.column_names])
+
+
+def group_offsets(table):
+    keys = table.select(GROUP_KEYS).to_pandas()
+    starts = np.flatnonzero(keys.ne(keys.shift()).any(axis=1).to_numpy())
+    stops = np.append(starts[1:], len(keys))
+    groups = keys.iloc[starts].reset_index(drop=True).assign(start=starts, stop=stops)
+    if STATUS in table.column_names:
+        valid = np.concatenate([[0], np.cumsum(table[STATUS].is_valid().to_numpy(zero_copy_only=False))])
+        groups["status_stop"] = starts + valid[stops] - valid[starts]
+    else:
+        groups["status_stop"] = stops
+    return groups
+
+
+class TableIndex:
+    # table 必须已经按 sort_for_index 排好序，groups 为对应的 group_offsets 结果
+    def __init__(self, table, groups):
+        self.table = table
+        self.groups = groups
+        self._meetings = {
+            meeting: (group.year.to_numpy(), group.start.to_numpy(), group.stop.to_numpy(), group.status_stop.to_numpy())
+            for meeting, group in groups.sort_values(GROUP_KEYS).groupby("meeting", sort=False, observed=True)
+        }
+
+    @classmethod
+    def from_segments(cls, segments):
+        # segments 为 (table, groups) 的列表，各段单独排序；首尾相接成一张表，组偏移按前面各段的行数平移
+        shifts = np.cumsum([0] + [len(table) for table, _ in segments[:-1]])
+        groups = pd.concat([
+            groups.assign(**{col: groups[col] + shift for col in ["start", "stop", "status_stop"]})
+            for (_, groups), shift in zip(segments, shifts)
+        ], ignore_index=True)
+        return cls(pa.concat_tables([table for table, _ in segments]), groups)
+
+    def _ranges(self, meeting, years, status_not_null):
+        if meeting is None:
+            found = self._meetings.values()
+        else:
+            found = [self._meetings[meeting]] if meeting in self._meetings else []
+        for year, start, stop, status_stop in found:
+            lo, hi = (0, len(year)) if years is None else (
+                np.searchsorted(year, years[0], "left"), np.searchsorted(year, years[1], "right")
+            )
+            yield from zip(start[lo:hi], (status_stop if status_not_null else stop)[lo:hi])
+
+    def select(self, meeting=None, years=None, columns=None, status_not_null=False):
+        table = self.table.select(columns) if columns is not None else self.table
+        # 首尾相接的组合并成一段，结果只是原表的零拷贝切片
+        ranges = []
+        for start, stop in self._ranges(meeting, years, status_not_null):
+            if ranges and ranges[-1][1] == start:
+                ranges[-1][1] = stop
+            elif stop > start:
+                ranges.append([start, stop])
+        if not ranges:
+            return table.slice(0, 0)
+        return pa.concat_tables([table.slice(start, stop - start) for start, stop in ranges])
+
+    def count(self, meeting=None, years=None, status_not_null=False):
+        return int(sum(stop - start for start, stop in self._ranges(meeting, years, status_not_null)))
@@ -0,0 +1,110 @@
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+SHARED_DIR = "./data/shared"
+# 指向当前版本目录名的文件，整体替换即完成一次发布
+CURRENT = "CURRENT"
+# 除当前版本外再保留几个旧版本，尚未刷新的进程仍可打开
+KEEP_VERSIONS = 2
+
+
+def current_version(shared_dir=SHARED_DIR):
+    try:
+        with open(os.path.join(shared_dir, CURRENT)) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def _versions(shared_dir):
+    return sorted(
+        name for name in os.listdir(shared_dir)
+        if name.startswith("v") and os.path.isdir(os.path.join(shared_dir, name)) and not name.endswith(".tmp")
+    )
+
+
+def write_table(table, path):
+    if isinstance(table, pd.DataFrame):
+        table = pa.Table.from_pandas(table, preserve_index=False)
+    # 不压缩，读取端才能直接映射而不用解码
+    with pa.OSFile(path, "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _link(source, target):
+    # 硬链接而不复制；构建和追加都是写新文件再替换，不会原地改写已经链接进某个版本的文件
+    if os.path.isdir(source):
+        os.makedirs(target)
+        for name in os.listdir(source):
+            _link(os.path.join(source, name), os.path.join(target, name))
+    else:
+        os.link(source, target)
+
+
+def publish(tables, directories=None, shared_dir=SHARED_DIR):
+    # tables 为要写成 Arrow 文件的表；directories 为整个目录发布的产物（可用性位图、相关性矩阵等），按名称放进版本目录
+    os.makedirs(shared_dir, exist_ok=True)
+    previous = current_version(shared_dir)
+    versions = _versions(shared_dir)
+    version = "v{:06d}".format(int(versions[-1][1:]) + 1 if versions else 1)
+
+    tmp_dir = os.path.join(shared_dir, version + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for name, table in tables.items():
+        write_table(table, os.path.join(tmp_dir, f"{name}.arrow"))
+    for name, source in (directories or {}).items():
+        _link(source, os.path.join(tmp_dir, name))
+    # 没有重新给出的表和目录沿用上一版本
+    if previous is not None:
+        for file in os.listdir(os.path.join(shared_dir, previous)):
+            # 重新给出整表时，之前追加的各段已经包含在新表里
+            if "+" in file and file.split("+")[0] in tables:
+                continue
+            if not os.path.exists(os.path.join(tmp_dir, file)):
+                _link(os.path.join(shared_dir, previous, file), os.path.join(tmp_dir, file))
+    os.replace(tmp_dir, os.path.join(shared_dir, version))
+
+    with open(os.path.join(shared_dir, CURRENT + ".tmp"), "w") as f:
+        f.write(version)
+    os.replace(os.path.join(shared_dir, CURRENT + ".tmp"), os.path.join(shared_dir, CURRENT))
+
+    # 已映射旧文件的进程不受删除影响，映射会一直有效到它们关闭为止
+    for old in _versions(shared_dir)[:-(KEEP_VERSIONS + 1)]:
+        shutil.rmtree(os.path.join(shared_dir, old), ignore_errors=True)
+    return version
+
+
+def shared_path(name, version=None, shared_dir=SHARED_DIR):
+    version = version or current_version(shared_dir)
+    if version is None:
+        raise FileNotFoundError(f"No shared tables published under {shared_dir}; run build.py first")
+    return os.path.join(shared_dir, version, name)
+
+
+def segment_names(name, version=None, shared_dir=SHARED_DIR):
+    # build.py 发布的整表是第一段，append.py 每追加一批只发布新的一段 name+NNNNNN，已发布的段不再改写
+    directory = os.path.dirname(shared_path(name, version, shared_dir))
+    return [name] + sorted(
+        file.removesuffix(".arrow") for file in os.listdir(directory)
+        if file.startswith(name + "+") and file.endswith(".arrow") and not file.endswith(".groups.arrow")
+    )
+
+
+def next_segment(name, shared_dir=SHARED_DIR):
+    return "{}+{:06d}".format(name, len(segment_names(name, shared_dir=shared_dir)))
+
+
+def open_table(name, version=None, shared_dir=SHARED_DIR):
+    # 内存映射读取，多个进程共享同一份页缓存
+    source = pa.memory_map(shared_path(f"{name}.arrow", version, shared_dir))
+    return ipc.open_file(source).read_all()
+
+
+def open_segments(name, version=None, shared_dir=SHARED_DIR):
+    # 各段映射出来的 chunk 直接拼成一张表，不复制数据
+    return pa.concat_tables([open_table(segment, version, shared_dir) for segment in segment_names(name, version, shared_dir)])
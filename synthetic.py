@@ -0,0 +1,177 @@
+import argparse
+import os
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from conferences import reverse_conf_name_map
+
+# 真实数据的画像：各会议各年的论文数、状态分布、平均作者数、机构热度，以及各列的非空比例
+COUNT_PROFILE = "./data/count_data.csv"
+STATUS_PROFILE = "./data/sunburst_data.csv"
+AUTHOR_PROFILE = "./data/author_number_data.csv"
+INSTITUTION_PROFILE = "./data/node_info.csv"
+COLUMN_PROFILE = "./data/column_profile.csv"
+SYNTHETIC_DIR = "./data/synthetic"
+
+# 每个子进程一次生成的行数
+CHUNK_ROWS = 50_000
+# 与 corr_data.csv 的列一致，numeric_raw.csv 只带这些数值列
+NUMERIC = [
+    "gs_citation", "rating_avg", "confidence_avg", "replies_avg", "authors#_avg", "correctness_avg",
+    "presentation_avg", "recommendation_avg", "technical_novelty_avg", "empirical_novelty_avg",
+    "soundness_avg", "contribution_avg",
+]
+
+TOPICS = [
+    "learning", "neural", "network", "networks", "model", "models", "deep", "graph", "language", "vision",
+    "image", "video", "diffusion", "transformer", "transformers", "reinforcement", "policy", "robust",
+    "adversarial", "generative", "segmentation", "detection", "representation", "self-supervised",
+    "contrastive", "optimization", "gradient", "federated", "privacy", "fairness", "causal", "inference",
+    "bayesian", "uncertainty", "estimation", "reasoning", "retrieval", "multimodal", "3d", "point",
+    "cloud", "scene", "reconstruction", "rendering", "speech", "translation", "dialogue", "question",
+    "answering", "knowledge", "benchmark", "dataset", "efficient", "sparse", "attention", "memory",
+    "continual", "meta-learning", "few-shot", "zero-shot", "domain", "adaptation", "generalization",
+    "tracking", "pose", "motion", "planning", "control", "robot", "manipulation", "kernel", "theory",
+]
+FILLERS = ["the", "of", "and", "a", "to", "in", "we", "for", "with", "on", "via", "propose", "novel", "method"]
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "ta", "vo", "si", "pe", "da", "xu", "bi", "go", "fe", "zo", "ha"]
+# 长尾词表的大小，按 Zipf 分布抽取，语料越大出现的词越多
+TAIL_WORDS = 50_000
+
+
+def read_profile():
+    counts = pd.read_csv(COUNT_PROFILE)
+    status = pd.read_csv(STATUS_PROFILE)
+    authors = pd.read_csv(AUTHOR_PROFILE)
+    institutions = pd.read_csv(INSTITUTION_PROFILE, keep_default_na=False)
+    columns = pd.read_csv(COLUMN_PROFILE, index_col="Conference")
+    return counts, status, authors, institutions, columns
+
+
+@lru_cache(maxsize=None)
+def tail_words(n=TAIL_WORDS):
+    # 三个音节拼成的伪词，确定性生成，不依赖任何词典
+    k = len(SYLLABLES)
+    codes = np.arange(n)
+    return np.array([
+        SYLLABLES[a] + SYLLABLES[b] + SYLLABLES[c] + (str(d) if d else "")
+        for a, b, c, d in zip(codes % k, codes // k % k, codes // k ** 2 % k, codes // k ** 3)
+    ], dtype=object)
+
+
+def _split_join(values, sizes):
+    # 一次抽完所有行的值，再按每行的个数切开拼接，避免逐行调用随机数
+    return [";".join(part) for part in np.split(values, np.cumsum(sizes)[:-1])]
+
+
+def _text(rng, n, length, words):
+    # 常用虚词排在词表最前面，Zipf 抽样时它们出现得最多，和真实文本一样
+    vocabulary = np.concatenate([np.array(FILLERS + TOPICS, dtype=object), words])
+    sizes = rng.poisson(length, n) + 2
+    tokens = vocabulary[(rng.zipf(1.3, sizes.sum()) - 1) % len(vocabulary)]
+    return [" ".join(part) for part in np.split(tokens, np.cumsum(sizes)[:-1])]
+
+
+def _numeric(rng, column, n):
+    if column == "gs_citation":
+        return np.floor(rng.lognormal(2.0, 1.5, n))
+    if column == "replies_avg":
+        return rng.poisson(4, n) + rng.random(n)
+    if column == "authors#_avg":
+        return rng.poisson(3, n) + 1.0
+    if column == "confidence_avg":
+        return np.clip(rng.normal(3.5, 0.6, n), 1, 5)
+    # 其余都是 1~10 分的评审均分
+    return np.clip(rng.normal(5.5, 1.5, n), 1, 10)
+
+
+def generate_chunk(spec):
+    meeting, year, n, seed, status_mix, author_mean, author_pool, institutions, weights, fill = spec
+    rng = np.random.default_rng(seed)
+    words = tail_words()
+    author_num = rng.poisson(max(author_mean - 1, 0), n) + 1
+    # 作者编号偏向小号，少数作者会反复出现，职业轨迹类的统计才有意义
+    ids = (author_pool * rng.random(author_num.sum()) ** 1.5).astype(np.int64)
+    aff_num = np.minimum(author_num, 4)
+
+    data = {
+        "title": _text(rng, n, 8, words),
+        "abstract": _text(rng, n, 120, words),
+        "status": rng.choice(status_mix.index.to_numpy(), n, p=status_mix.to_numpy()) if len(status_mix) else None,
+        "author": _split_join(np.char.add("Author ", ids.astype(str)), author_num),
+        "aff_unique_norm": _split_join(rng.choice(institutions, aff_num.sum(), p=weights), aff_num),
+        "author_num": author_num,
+        "gs_version_total": rng.poisson(3, n),
+        "pdf_size": rng.integers(100_000, 20_000_000, n),
+    }
+    data["aff"] = data["aff_unique_norm"]
+    for column in NUMERIC:
+        data[column] = _numeric(rng, column, n)
+    for column in fill.index.difference(list(data) + ["year"]):
+        # 其余列只需要类型和缺失模式与真实数据一致
+        data[column] = np.array([f"{column} {i}" for i in range(16)], dtype=object)[rng.integers(0, 16, n)]
+
+    # 按真实数据里该会议各列的非空比例打洞
+    fill = fill.drop("year", errors="ignore")
+    raw = (
+        pd.DataFrame(data, columns=fill.index)
+        .where(rng.random((n, len(fill))) < fill.to_numpy())
+        .pipe(lambda x: pd.concat([pd.DataFrame({"meeting": meeting, "year": np.full(n, year)}), x], axis=1))
+    )
+    numeric = raw.loc[:, ["meeting", "year", "status", "title"] + NUMERIC]
+    return raw.to_csv(index=False, header=False), numeric.to_csv(index=False, header=False), raw.columns, numeric.columns
+
+
+def chunk_specs(scale, seed=0):
+    counts, status, authors, institutions, columns = read_profile()
+    counts = counts.assign(rows=np.maximum(1, np.round(counts.Count * scale)).astype(np.int64))
+    author_pool = max(1, int(counts.rows.sum() * 1.5))
+    weights = institutions["count"].to_numpy(np.float64) + 1
+    names = institutions.source.to_numpy(object)
+    mean_authors = authors.set_index(["Conference", "Year"]).iloc[:, 0]
+
+    specs = []
+    for conference, year, rows in counts.sort_values(["Conference", "Year"]).loc[:, ["Conference", "Year", "rows"]].itertuples(index=False):
+        mix = status.loc[status.meeting == conference, :].set_index("status")["count"]
+        author_mean = mean_authors.get((conference, year), mean_authors.mean())
+        for start in range(0, rows, CHUNK_ROWS):
+            specs.append((
+                reverse_conf_name_map[conference], year, min(CHUNK_ROWS, rows - start), [seed, len(specs)],
+                mix / mix.sum(), author_mean, author_pool, names, weights / weights.sum(), columns.loc[conference],
+            ))
+    return specs
+
+
+def generate(scale=1, out_dir=None, seed=0, jobs=None):
+    out_dir = out_dir or os.path.join(SYNTHETIC_DIR, f"{scale:g}x")
+    data_dir = os.path.join(out_dir, "data")
+    os.makedirs(data_dir, exist_ok=True)
+    raw_path, numeric_path = os.path.join(data_dir, "raw.csv"), os.path.join(data_dir, "numeric_raw.csv")
+    rows = 0
+    # 子进程各自生成一块 CSV 文本，主进程按顺序追加到文件末尾
+    with ProcessPoolExecutor(jobs) as pool, open(raw_path + ".tmp", "w") as raw, open(numeric_path + ".tmp", "w") as numeric:
+        specs = chunk_specs(scale, seed)
+        for i, (raw_text, numeric_text, raw_columns, numeric_columns) in enumerate(pool.map(generate_chunk, specs)):
+            if i == 0:
+                raw.write(",".join(raw_columns) + "\n")
+                numeric.write(",".join(numeric_columns) + "\n")
+            raw.write(raw_text)
+            numeric.write(numeric_text)
+            rows += specs[i][2]
+    os.replace(raw_path + ".tmp", raw_path)
+    os.replace(numeric_path + ".tmp", numeric_path)
+    return out_dir, rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic raw.csv / numeric_raw.csv shaped like the real corpus")
+    parser.add_argument("--scale", type=float, default=1, help="multiple of the real paper counts, e.g. 1, 10, 100")
+    parser.add_argument("--out", default=None, help="output root; CSVs go to <out>/data (default ./data/synthetic/<scale>x)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--jobs", type=int, default=None, help="number of worker processes")
+    args = parser.parse_args()
+    out_dir, rows = generate(args.scale, args.out, args.seed, args.jobs)
+    print(f"Wrote {rows} papers to {out_dir}/data; run build.py from {out_dir} to derive the remaining tables")
@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from affiliations import co_occurrence, incidence
+
+
+def test_co_occurrence_matches_dense_product():
+    aff = pd.Series(
+        ["MIT;Stanford", "Stanford; MIT ;CMU", None, "", "CMU;CMU", "Oxford", "MIT;Oxford;CMU", "Stanford"],
+        dtype="string",
+    )
+    names, matrix = incidence(aff)
+    counts = co_occurrence(matrix).toarray()
+
+    # 参照：逐篇论文去重后的机构集合做交叉表，再求 B^T B
+    papers = (
+        aff.str.split(";").explode().str.strip()
+        .loc[lambda x: x.notna() & (x != "")]
+        .rename_axis("paper").reset_index(name="institution")
+        .drop_duplicates()
+    )
+    dense = pd.crosstab(papers.paper, papers.institution).reindex(columns=list(names))
+    expected = np.triu(dense.T.to_numpy() @ dense.to_numpy())
+    np.testing.assert_array_equal(counts, expected)
+    assert counts[names.get_loc("MIT"), names.get_loc("MIT")] == 3
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+
+from careers import career_aggregates, career_rows, read_first_author_info
+from conferences import conf_name_map
+
+
+def authorship(seed=0, papers=300):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for paper in range(papers):
+        meeting = rng.choice(["aaai", "cvpr", "iclr"])
+        year = int(rng.integers(2015, 2023))
+        for position, author in enumerate(rng.choice(40, rng.integers(1, 5), replace=False)):
+            rows.append((paper, position, f"Author {author}", meeting, year))
+    df = pd.DataFrame(rows, columns=["paper_id", "position", "author", "meeting", "year"])
+    return df.astype({"author": "category", "meeting": "category"})
+
+
+def reference_first_author_info(df):
+    # 逐行按定义计算：当年的论文数、到当年为止发表过的不同会议数
+    rows = []
+    for row in df.loc[df.position == 0, :].itertuples():
+        own = df.loc[df.author == row.author, :]
+        rows.append({
+            "author": row.author,
+            "meeting": row.meeting,
+            "year": row.year,
+            "elapsed": row.year - own.year.min(),
+            "paper_count": (own.year == row.year).sum(),
+            "meeting_unique_count_upto_elapsed": own.loc[own.year <= row.year, "meeting"].nunique(),
+        })
+    return pd.DataFrame(rows)
+
+
+def reference_author_info(df):
+    rows = []
+    for (meeting, author), group in df.groupby(["meeting", "author"], observed=True):
+        first = group.loc[group.position == 0, :]
+        if len(first):
+            rows.append({"meeting": meeting, "author": author, "interval": first.year.min() - group.year.min()})
+    return pd.DataFrame(rows)
+
+
+def normalize(frame):
+    frame = frame.astype({column: str for column in ["author", "meeting"]}).astype(
+        {column: np.int64 for column in frame.columns if column not in ["author", "meeting"]}
+    )
+    return frame.loc[:, sorted(frame.columns)].sort_values(sorted(frame.columns)).reset_index(drop=True)
+
+
+def test_career_rows_match_reference():
+    df = authorship()
+    first_author_info, author_info = career_rows(df)
+    pd.testing.assert_frame_equal(normalize(first_author_info), normalize(reference_first_author_info(df)))
+    pd.testing.assert_frame_equal(normalize(author_info), normalize(reference_author_info(df)))
+
+
+def baseline_aggregates(info):
+    # 改写前 lib.py 里四张 Outcome 图各自的 groupby/transform 写法
+    return {
+        "annual_paper": (
+            info
+            .groupby(["author", "elapsed"])
+            .apply(lambda x: len(x), include_groups=False)
+            .reset_index()
+            .rename(columns={0: "Annual Paper Count", "author": "Author", "elapsed": "Years Since First Publication"})
+        ),
+        "unique_meeting": (
+            info
+            .groupby(["elapsed", "author"])
+            .meeting_unique_count_upto_elapsed
+            .unique()
+            .explode()
+            .reset_index()
+            .assign(elapsed=lambda x: x.elapsed.astype(str))
+            .rename(columns={"elapsed": "Years Since First Publication",
+                             "meeting_unique_count_upto_elapsed": "Number of Distinct Conferences Published In",
+                             "author": "Author"})
+        ),
+        "paper_count": (
+            info
+            .groupby(["year", "author"])
+            .paper_count
+            .unique()
+            .explode()
+            .reset_index()
+            .assign(year=lambda x: x.year.astype(str))
+            .rename(columns={"year": "Year", "paper_count": "Annual Paper Count", "author": "Author"})
+        ),
+        "paper_count_data": (
+            info
+            .assign(count_=lambda x: x.groupby(["year", "author", "meeting"]).paper_count.transform("count"))
+            .groupby(["year", "meeting"])
+            .count_
+            .mean()
+            .reset_index()
+            .replace(conf_name_map)
+        ),
+    }
+
+
+def comparable(frame):
+    # explode 之后是 object 列，先还原成数值类型
+    frame = frame.infer_objects()
+    frame = frame.astype({column: str for column in frame.columns if not pd.api.types.is_numeric_dtype(frame[column])})
+    frame = frame.astype({column: np.float64 for column in frame.columns if pd.api.types.is_numeric_dtype(frame[column])})
+    return frame.loc[:, sorted(frame.columns)].sort_values(sorted(frame.columns)).reset_index(drop=True)
+
+
+def test_career_aggregates_match_baseline(tmp_path):
+    path = tmp_path / "first_author_info.csv"
+    career_rows(authorship())[0].to_csv(path, index=False)
+    info = read_first_author_info(path)
+    assert info.author.dtype == "category" and info.meeting.dtype == "category"
+    assert info.year.dtype == np.int16 and info.elapsed.dtype == np.int16
+    aggregates = career_aggregates(info)
+    for name, expected in baseline_aggregates(pd.read_csv(path)).items():
+        pd.testing.assert_frame_equal(comparable(aggregates[name]), comparable(expected), obj=name)
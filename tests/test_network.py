@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from network import ego_nodes, top_k_edges
+
+
+def reference_ego_nodes(weights, center, hops):
+    coo = weights.tocoo()
+    neighbours = {}
+    for i, j in zip(coo.row, coo.col):
+        neighbours.setdefault(i, set()).add(j)
+        neighbours.setdefault(j, set()).add(i)
+    reached, frontier = {center}, {center}
+    for _ in range(hops):
+        frontier = set().union(*(neighbours.get(node, set()) for node in frontier)) - reached
+        reached |= frontier
+    return np.array(sorted(reached))
+
+
+def upper(rows, cols, n):
+    matrix = sparse.coo_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, n))
+    # 与 read_affiliations 一致，只留严格上三角
+    return sparse.triu(matrix + matrix.T, k=1).tocsr()
+
+
+def test_ego_nodes_matches_bfs_on_random_graph():
+    rng = np.random.default_rng(0)
+    weights = upper(rng.integers(0, 60, 120), rng.integers(0, 60, 120), 60)
+    for center in [0, 7, 31]:
+        for hops in [1, 2, 3]:
+            np.testing.assert_array_equal(ego_nodes(weights, center, hops), reference_ego_nodes(weights, center, hops))
+
+
+def test_ego_nodes_with_wide_frontier():
+    # 0 连着 256 个叶子，257 又连着全部叶子：第二步时 257 有 256 个前沿邻居
+    leaves = np.arange(1, 257)
+    weights = upper(
+        np.concatenate([np.zeros(256, dtype=int), leaves]), np.concatenate([leaves, np.full(256, 257)]), 258
+    )
+    np.testing.assert_array_equal(ego_nodes(weights, 0, 2), np.arange(258))
+    np.testing.assert_array_equal(ego_nodes(weights, 0, 2), reference_ego_nodes(weights, 0, 2))
+
+
+def reference_top_k_edges(edges, k):
+    # 逐个节点取它全部边里权重最大的 k 条，并集即保留的边
+    keep = set()
+    for node in set(edges.source) | set(edges.target):
+        own = edges.loc[(edges.source == node) | (edges.target == node), :]
+        keep |= set(own.sort_values("weight", ascending=False, kind="stable").index[:k])
+    return edges.loc[sorted(keep), :]
+
+
+def test_top_k_edges_ranks_each_node_over_all_its_edges():
+    edges = pd.DataFrame({"source": [0, 0, 1, 2, 1], "target": [1, 2, 2, 3, 3], "weight": [10, 9, 8, 1, 2]})
+    kept = top_k_edges(edges, 1)
+    assert set(zip(kept.source, kept.target)) == {(0, 1), (0, 2), (1, 3)}
+
+
+def test_top_k_edges_matches_per_node_reference():
+    rng = np.random.default_rng(1)
+    weights = upper(rng.integers(0, 40, 200), rng.integers(0, 40, 200), 40).tocoo()
+    # 权重各不相同，排名没有并列
+    edges = pd.DataFrame({"source": weights.row, "target": weights.col, "weight": rng.permutation(weights.nnz)})
+    for k in [1, 2, 5]:
+        pd.testing.assert_frame_equal(top_k_edges(edges, k).sort_index(), reference_top_k_edges(edges, k))
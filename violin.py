@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.colors import hex_to_rgb, qualitative
+
+KDE_POINTS = 100
+# 样本量超过该值时先分箱再做核密度估计
+KDE_EXACT_LIMIT = 20_000
+KDE_BINS = 1024
+MAX_OUTLIERS = 200
+
+
+def _bandwidth(values, iqr):
+    # 与 plotly 默认一致的 Silverman 规则，退化时逐级放宽
+    std = values.std(ddof=1) if len(values) > 1 else 0.0
+    for spread in (min(std, iqr / 1.349), std):
+        if spread > 0:
+            return 1.059 * spread * len(values) ** -0.2
+    return 1.0
+
+
+def kde(values, grid, bandwidth):
+    if len(values) > KDE_EXACT_LIMIT:
+        counts, edges = np.histogram(values, bins=KDE_BINS)
+        centers, weights = (edges[:-1] + edges[1:]) / 2, counts
+    else:
+        centers, weights = values, np.ones(len(values))
+    z = (grid[:, None] - centers[None, :]) / bandwidth
+    return (weights * np.exp(-0.5 * z * z)).sum(axis=1) / (len(values) * bandwidth * np.sqrt(2 * np.pi))
+
+
+def violin_stats(values, hover=None):
+    keep = ~np.isnan(values)
+    values = values[keep]
+    if not len(values):
+        return None
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = (values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)
+    bandwidth = _bandwidth(values, iqr)
+    grid = np.linspace(values.min() - 2 * bandwidth, values.max() + 2 * bandwidth, KDE_POINTS)
+
+    outliers = np.flatnonzero(~inside)
+    # 离群点过多时只保留离中位数最远的一部分
+    outliers = outliers[np.argsort(-np.abs(values[outliers] - median), kind="stable")[:MAX_OUTLIERS]]
+    return {
+        "q1": q1,
+        "median": median,
+        "q3": q3,
+        "lowerfence": values[inside].min(),
+        "upperfence": values[inside].max(),
+        "grid": grid,
+        "density": kde(values, grid, bandwidth),
+        "outliers": values[outliers],
+        "hover": None if hover is None else np.asarray(hover)[keep][outliers],
+    }
+
+
+def _rgba(color, alpha):
+    return "rgba({}, {}, {}, {})".format(*hex_to_rgb(color), alpha)
+
+
+def summary_violin(frame, x, y, hover=None, points=True):
+    groups = frame.groupby(x, sort=pd.api.types.is_numeric_dtype(frame[x]), observed=True)
+    rng = np.random.default_rng(0)
+    fig = go.Figure()
+    ticks = []
+    for i, (category, group) in enumerate(groups):
+        stats = violin_stats(
+            group[y].to_numpy(np.float64),
+            None if hover is None else group[hover].to_numpy()
+        )
+        if stats is None:
+            continue
+        name, color = str(category), qualitative.Plotly[i % len(qualitative.Plotly)]
+        ticks.append((i, name))
+
+        half = 0.4 * stats["density"] / stats["density"].max()
+        fig.add_trace(go.Scatter(
+            x=np.concatenate([i - half, (i + half)[::-1]]),
+            y=np.concatenate([stats["grid"], stats["grid"][::-1]]),
+            fill="toself",
+            mode="lines",
+            line=dict(color=color, width=1),
+            fillcolor=_rgba(color, 0.5),
+            name=name,
+            legendgroup=name,
+            hoverinfo="skip"
+        ))
+        fig.add_trace(go.Box(
+            x=[i],
+            q1=[stats["q1"]],
+            median=[stats["median"]],
+            q3=[stats["q3"]],
+            lowerfence=[stats["lowerfence"]],
+            upperfence=[stats["upperfence"]],
+            width=0.1,
+            boxpoints=False,
+            marker_color=color,
+            name=name,
+            legendgroup=name,
+            showlegend=False
+        ))
+        if points and len(stats["outliers"]):
+            fig.add_trace(go.Scatter(
+                x=i + (rng.random(len(stats["outliers"])) - 0.5) * 0.4,
+                y=stats["outliers"],
+                mode="markers",
+                marker=dict(size=4, color=color),
+                hovertext=stats["hover"],
+                name=name,
+                legendgroup=name,
+                showlegend=False
+            ))
+
+    fig.update_xaxes(
+        title_text=x,
+        tickmode="array",
+        tickvals=[i for i, _ in ticks],
+        ticktext=[name for _, name in ticks]
+    )
+    fig.update_yaxes(title_text=y)
+    fig.update_layout(template="plotly_dark", legend_title_text=x)
+    return fig
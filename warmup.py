@@ -0,0 +1,136 @@
+import argparse
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import lib
+from shared import current_version
+
+THREAD_NAME = "warmup"
+
+# Streamlit 服务进程里每个发布版本预热一次，{版本: 报告}；报告为 None 表示还在进行
+_reports = {}
+_lock = threading.Lock()
+
+
+class _QuietWarmUpThread(logging.Filter):
+    # 预热线程不属于任何页面会话，Streamlit 在其中每次调用缓存函数都会告警缺少 ScriptRunContext
+    def filter(self, record):
+        return not threading.current_thread().name.startswith(THREAD_NAME)
+
+
+logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(_QuietWarmUpThread())
+
+
+def base_tasks():
+    # 生成图要用到的数据，先并发加载
+    return {
+        "catalog": lib.get_catalog,
+        "conf_time": lib.get_conf_time,
+        "count": lib.get_count_data,
+        "sunburst": lib.get_sunburst_data,
+        "author_number_data": lib.get_author_number_data,
+        "paper_count_data": lib.get_paper_count_data,
+        "numeric_attributes": lib.get_numeric_attributes,
+        "available": lib.read_available,
+        "attribute": lib.get_attribute_data,
+        "keyword_options": lib.get_keyword_options,
+    }
+
+
+def figure_tasks():
+    # 各页面打开时默认选项对应的图，都经 FIGURE_CACHE 缓存
+    catalog = lib.get_catalog()
+    conference = catalog[catalog.names[0]]
+    attributes = lib.get_numeric_attributes(dropna=True)
+    return {
+        "sunburst_fig": partial(lib.get_sunburst_fig),
+        "available_fig": partial(lib.get_available_fig),
+        "attribute_fig": partial(lib.get_attribute_fig),
+        "unique_meeting_fig": partial(lib.get_unique_meeting_fig),
+        "annual_paper_fig": partial(lib.get_annual_paper_fig),
+        "paper_count_fig": partial(lib.get_paper_count_fig),
+        "interval_fig": partial(lib.get_interval_fig),
+        "author_number_fig": partial(lib.get_author_number_fig),
+        "conf_attribute_fig": partial(
+            lib.get_conf_attribute_fig, conference.name, conference.first_year, conference.last_year
+        ),
+        "violin_fig": partial(
+            lib.get_violin_fig, conference.name, attributes[0], conference.first_year, conference.last_year
+        ),
+        "collaborate_graph": partial(lib.get_collaborate_graph, 0, lib.GRAPH_TOP_K, None, 1, None),
+    }
+
+
+def _run(tasks, pool):
+    def timed(func):
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
+
+    futures = {name: pool.submit(timed, func) for name, func in tasks.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def warm_up(jobs=None):
+    start = time.perf_counter()
+    version = current_version()
+    # 先并发加载基础数据，图依赖这些数据，再并发生成
+    figures = figure_tasks()
+    with ThreadPoolExecutor(jobs, thread_name_prefix=THREAD_NAME) as pool:
+        timings = _run(base_tasks(), pool)
+        timings.update(_run(figures, pool))
+    return {"version": version, "seconds": time.perf_counter() - start, "finished_at": time.time(), "tasks": timings}
+
+
+def _warm(version, jobs):
+    try:
+        report = warm_up(jobs)
+    except Exception as e:
+        logging.getLogger(__name__).exception("Warm-up for shared version %s failed", version)
+        report = {"version": version, "error": repr(e)}
+    with _lock:
+        _reports[version] = report
+
+
+def start_warm_up(jobs=None):
+    # 页面脚本开头调用：本进程第一次遇到某个发布版本时起一个后台线程，填满本进程的 st.cache_* 和 FIGURE_CACHE，
+    # 不挡住当前这次渲染；快照模式下没有发布版本，也就不预热
+    version = current_version()
+    with _lock:
+        if version is None or version in _reports:
+            return
+        _reports[version] = None
+    threading.Thread(target=_warm, args=(version, jobs), name=THREAD_NAME, daemon=True).start()
+
+
+def health():
+    version = current_version()
+    with _lock:
+        started, report = version in _reports, _reports.get(version)
+    if not started:
+        state = "cold"
+    elif report is None:
+        state = "warming"
+    else:
+        state = "failed" if "error" in report else "ready"
+    return {"version": version, "state": state, "ready": state == "ready", "report": report}
+
+
+def is_ready():
+    # 只看本进程：当前发布版本的预热已经完成
+    return health()["ready"]
+
+
+if __name__ == "__main__":
+    # 服务进程会自己预热；命令行只预先填好 FIGURE_CACHE 的磁盘层，供之后启动的各个服务进程共用
+    parser = argparse.ArgumentParser(description="Prefill the on-disk figure cache shared by all Streamlit server processes")
+    parser.add_argument("--jobs", type=int, default=None, help="number of worker threads")
+    args = parser.parse_args()
+    lib.quiet_bare_mode()
+    report = warm_up(args.jobs)
+    for name, seconds in sorted(report["tasks"].items(), key=lambda x: -x[1]):
+        print(f"[warm] {name}: {seconds:.2f}s")
+    print(f"Figure cache on disk filled for shared version {report['version']} after {report['seconds']:.2f}s")